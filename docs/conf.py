@@ -1,8 +1,8 @@
-import os
-import sys
-
-# Add source directory to path
-sys.path.insert(0, os.path.abspath('../src/openparse'))
+# Build with:
+#   sphinx-build -j auto -b html docs docs/_build/html
+#
+# API pages are generated by sphinx-autoapi, which parses the source statically
+# instead of importing openparse (and its torch/transformers deps) on every build.
 
 project = 'OpenParse'
 copyright = '2025'
@@ -10,11 +10,10 @@ author = 'Michael Mooring'
 release = '0.7.3'
 
 extensions = [
-    'sphinx.ext.autodoc',
+    'autoapi.extension',
     'sphinx.ext.napoleon',
     'sphinx.ext.viewcode',
     'myst_parser',
-    'sphinx.ext.autosummary',
 ]
 
 # Source file mappings
@@ -27,14 +26,17 @@ source_suffix = {
 html_theme = 'sphinx_rtd_theme'
 html_static_path = ['_static']
 
-# AutoDoc settings
+# AutoAPI settings
+autoapi_type = 'python'
+autoapi_dirs = ['../src/openparse']
+autoapi_root = 'api'
+autoapi_member_order = 'bysource'
+autoapi_python_class_content = 'both'
 autodoc_typehints = 'description'
-autodoc_member_order = 'bysource'
-autoclass_content = 'both'
 
 # Build settings
 templates_path = ['_templates']
 exclude_patterns = ['_build', 'Thumbs.db', '.DS_Store']
 
 # Include README.md
-root_doc = 'index'
\ No newline at end of file
+root_doc = 'index'
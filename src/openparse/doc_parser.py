@@ -1,5 +1,16 @@
+import asyncio
+import copy
+import hashlib
+import logging
+import os
+import pickle
+import stat
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import List, Literal, TypedDict, TypeVar, Union, Optional, Dict
+from typing import Any, List, Literal, Tuple, TypedDict, TypeVar, Union, Optional, Dict, Iterable
 
 from openparse import consts, tables, text
 from openparse._types import NOT_GIVEN, NotGiven
@@ -12,7 +23,6 @@ from openparse.processing import (
 from openparse.schemas import Node, ParsedDocument, TableElement, TextElement
 
 from openparse.schemas import ImageElement
-from openparse.processing.markitdown_doc_parser import DocumentParser as MarkItDownParser
 from openparse.config import config, Config
 
 import zipfile
@@ -21,6 +31,31 @@ import shutil
 
 IngestionPipelineType = TypeVar("IngestionPipelineType", bound=IngestionPipeline)
 
+logger = logging.getLogger(__name__)
+
+# Per-process DocumentParser used by PDF directory workers
+_pdf_worker_parser: Optional["DocumentParser"] = None
+
+
+def _init_pdf_worker(parser: "DocumentParser") -> None:
+    global _pdf_worker_parser
+    _pdf_worker_parser = parser
+
+
+def _parse_pdf_in_worker(
+    args: Tuple[Path, bool, Optional[Dict[str, bool]], Optional[str]],
+) -> Optional["ParsedDocument"]:
+    """Parse a single PDF in a worker process. Returns None if parsing fails."""
+    assert _pdf_worker_parser is not None, "Worker not initialized."
+    file_path, ocr, parse_elements, embeddings_provider = args
+    try:
+        return _pdf_worker_parser._process_pdf_file(
+            file_path, ocr, parse_elements, embeddings_provider
+        )
+    except Exception as e:
+        logger.error(f"❌ Failed to parse {file_path}: {e}")
+        return None
+
 
 class UnitableArgsDict(TypedDict, total=False):
     parsing_algorithm: Literal["unitable"]
@@ -55,6 +90,11 @@ def _table_args_dict_to_model(
         )
 
 
+def _step_fingerprint(step: Any) -> Tuple[str, str]:
+    """A processing step's type and settings, so changing either misses the result cache."""
+    return type(step).__qualname__, repr(sorted(getattr(step, "__dict__", {}).items()))
+
+
 class DocumentParser:
     """
     A parser for extracting elements from PDF documents, including text and tables.
@@ -62,6 +102,8 @@ class DocumentParser:
     Attributes:
         processing_pipeline (Optional[IngestionPipelineType]): A subclass of IngestionPipeline to process extracted elements.
         table_args (Optional[Union[TableTransformersArgsDict, PyMuPDFArgsDict]]): Arguments to customize table parsing.
+        parallel (bool): Whether to run text and table extraction concurrently. Disable for deterministic, single-threaded parsing.
+        result_cache_size (int): Number of parsed single files to keep, keyed on file content, parse settings and pipeline steps. Re-parsing a cached file skips extraction. 0 (the default) disables the cache.
     """
 
     _verbose: bool = False
@@ -75,9 +117,17 @@ class DocumentParser:
         use_markitdown: bool = False,
         llm_client: Optional[object] = None,
         verbose: bool = False,
+        parallel: bool = True,
+        result_cache_size: int = 0,
          **kwargs
     ):
         self._verbose = verbose
+        self.parallel = parallel
+
+        # Parsed single files, keyed on content hash and parse settings
+        self.result_cache_size = result_cache_size
+        self._result_cache: "OrderedDict[tuple, ParsedDocument]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
         
         # Initialize processing pipeline
         self.processing_pipeline: IngestionPipeline
@@ -93,29 +143,97 @@ class DocumentParser:
         
         # Initialize parsers and args
         self.table_args = table_args
+        self.table_args_obj = (
+            _table_args_dict_to_model(table_args) if table_args else None
+        )
         self.use_markitdown = use_markitdown
+        self.llm_client = llm_client
         if use_markitdown:
+            # MarkItDown pulls in converters for every office format, so it's only
+            # imported by parsers that use it
+            from openparse.processing.markitdown_doc_parser import (
+                DocumentParser as MarkItDownParser,
+            )
+
             self.markitdown_parser = MarkItDownParser(llm_client=llm_client)
 
+        # Resolve the single-file parser once so parse() doesn't branch on it per call
+        self._parse_impl = (
+            self._parse_markitdown_file if use_markitdown else self._process_pdf_file
+        )
+
     def _process_directory(
         self,
         files: List[Path],
-        batch_size: int
+        batch_size: int,
+        workers: Optional[int] = None,
+    ) -> List[ParsedDocument]:
+        """
+        Process directory of files. The MarkItDown parser picks threads or processes
+        depending on the formats involved, see its `parse_batch`.
+        """
+        supported = self.markitdown_parser.SUPPORTED_FORMATS
+        files = [f for f in files if f.suffix.lower() in supported]
+        results = self.markitdown_parser._map_files(files, batch_size, workers)
+        return self._directory_documents(
+            [(f, result) for f, result in zip(files, results) if result is not None]
+        )
+
+    async def _aprocess_directory(
+        self,
+        files: List[Path],
+        max_concurrency: int,
+    ) -> List[ParsedDocument]:
+        """Process directory of files on threads, at most `max_concurrency` at a time."""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def parse_one(file_path: Path):
+            async with semaphore:
+                return await loop.run_in_executor(
+                    None, self.markitdown_parser._try_parse, file_path
+                )
+
+        results = await asyncio.gather(*(parse_one(f) for f in files))
+        return self._directory_documents(
+            [(f, result) for f, result in zip(files, results) if result is not None]
+        )
+
+    @staticmethod
+    def _directory_documents(
+        parsed: List[Tuple[Path, Tuple[List[Node], Any]]],
     ) -> List[ParsedDocument]:
-        """Process directory of files in batches."""
-        results = self.markitdown_parser.parse_batch(files, batch_size)
         return [
             ParsedDocument(
                 nodes=nodes,
-                filename=file_path.name,  # Use file_path from enumerate
+                filename=file_path.name,
                 num_pages=1,
                 coordinate_system=consts.COORDINATE_SYSTEM,
                 table_parsing_kwargs=None,
                 **metadata
             )
-            for file_path, (nodes, metadata) in zip(files, results)
+            for file_path, (nodes, metadata) in parsed
         ]
 
+    def _list_directory(self, directory: Path) -> List[Path]:
+        """Supported files directly inside `directory`."""
+        return self._scan_directory(directory, self.markitdown_parser.SUPPORTED_FORMATS)
+
+    @staticmethod
+    def _scan_directory(directory: Path, suffixes: Iterable[str]) -> List[Path]:
+        """
+        Files directly inside `directory` with one of `suffixes`. Uses `os.scandir`, whose
+        entries carry their file type, so filtering costs no extra `stat` per file.
+        """
+        suffixes = frozenset(suffixes)
+        with os.scandir(directory) as entries:
+            return [
+                Path(entry.path)
+                for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in suffixes
+                and entry.is_file()
+            ]
+
     def _process_markitdown(
         self,
         file_path: Path,
@@ -142,26 +260,101 @@ class DocumentParser:
             file_size=metadata.get('file_size')
         )
 
-    def _process_pdfminer(
+    def _process_pdf_file(
         self,
-        file: Union[str, Path],
+        file_path: Path,
+        ocr: bool,
         parse_elements: Optional[Dict[str, bool]],
         embeddings_provider: Optional[str],
-        ocr: bool
     ) -> ParsedDocument:
-        """Process file with PDFMiner."""
+        """Process a single PDF with PDFMiner."""
         temp_config = self._update_config(parse_elements, embeddings_provider)
-        doc = Pdf(file)
+        doc = Pdf(file_path)
         nodes = self._extract_nodes(doc, ocr, temp_config)
         return ParsedDocument(
             nodes=nodes,
-            filename=Path(file).name,
+            filename=file_path.name,
             num_pages=doc.num_pages,
             coordinate_system=consts.COORDINATE_SYSTEM,
             table_parsing_kwargs=self._get_table_kwargs(),
             **doc.file_metadata
         )
 
+    def _process_pdf_directory(
+        self,
+        directory: Path,
+        ocr: bool,
+        parse_elements: Optional[Dict[str, bool]],
+        embeddings_provider: Optional[str],
+        workers: Optional[int],
+    ) -> List[ParsedDocument]:
+        """Process the PDFs in a directory, in parallel across processes when possible."""
+        files = self._scan_directory(directory, (".pdf",))
+        tasks = [(f, ocr, parse_elements, embeddings_provider) for f in files]
+        workers = workers or os.cpu_count() or 1
+
+        # Layout analysis is CPU-bound, so threads wouldn't help; every worker gets a copy
+        # of this parser, which rules out pipelines holding clients that can't be pickled.
+        results: List[Optional[ParsedDocument]]
+        if workers > 1 and len(files) > 1 and self._is_picklable():
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(files)),
+                initializer=_init_pdf_worker,
+                initargs=(self,),
+            ) as executor:
+                results = list(executor.map(_parse_pdf_in_worker, tasks))
+        else:
+            results = []
+            for task in tasks:
+                try:
+                    results.append(self._process_pdf_file(*task))
+                except Exception as e:
+                    logger.error(f"❌ Failed to parse {task[0]}: {e}")
+        return [result for result in results if result is not None]
+
+    def _is_picklable(self) -> bool:
+        try:
+            pickle.dumps(self)
+        except Exception:
+            return False
+        return True
+
+    def _process_zip(
+        self,
+        file_path: Path,
+        batch_size: int,
+        workers: Optional[int],
+    ) -> List[ParsedDocument]:
+        """Process the files of a ZIP archive with MarkItDown."""
+        # Extract files from ZIP and process each separately
+        with zipfile.ZipFile(file_path, 'r') as zip_ref:
+            files = []
+            for filename in zip_ref.namelist():
+                # Extract to temporary directory
+                temp_dir = Path(tempfile.mkdtemp())
+                extracted_path = temp_dir / Path(filename).name
+                with zip_ref.open(filename) as source, open(extracted_path, 'wb') as target:
+                    shutil.copyfileobj(source, target)
+                files.append(extracted_path)
+
+            # Process extracted files
+            try:
+                return self._process_directory(files, batch_size, workers)
+            finally:
+                # Clean up temp files
+                shutil.rmtree(temp_dir)
+
+    def _parse_markitdown_file(
+        self,
+        file_path: Path,
+        ocr: bool,
+        parse_elements: Optional[Dict[str, bool]],
+        embeddings_provider: Optional[str],
+    ) -> ParsedDocument:
+        """Parse a single document with MarkItDown; shares `_process_pdf_file`'s signature."""
+        nodes, metadata = self.markitdown_parser.parse(file_path)
+        return self._process_markitdown(file_path, nodes, metadata)
+
     def _update_config(
         self,
         parse_elements: Optional[Dict[str, bool]],
@@ -183,10 +376,22 @@ class DocumentParser:
         temp_config: Config
     ) -> List[Node]:
         """Extract and process nodes from document."""
-        text_nodes = self._extract_text_nodes(doc, ocr)
-        table_nodes = self._extract_table_nodes(doc, temp_config)
-        nodes = text_nodes + table_nodes
-        return self.processing_pipeline.run(nodes)
+        # OCR and table parsing both go through PyMuPDF, which isn't thread-safe. Single-page
+        # documents take the serial path: there's too little work to amortize a thread pool.
+        if (
+            self.parallel
+            and not ocr
+            and doc.num_pages > 1
+            and self._tables_enabled(temp_config)
+        ):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                text_future = executor.submit(self._extract_text_nodes, doc, ocr)
+                table_future = executor.submit(self._extract_table_nodes, doc, temp_config)
+                text_nodes, table_nodes = text_future.result(), table_future.result()
+        else:
+            text_nodes = self._extract_text_nodes(doc, ocr)
+            table_nodes = self._extract_table_nodes(doc, temp_config)
+        return self.processing_pipeline.run(chain(text_nodes, table_nodes))
 
     def _extract_text_nodes(self, doc: Pdf, ocr: bool) -> List[Node]:
         """Extract text nodes from document."""
@@ -203,15 +408,17 @@ class DocumentParser:
         temp_config: Config
     ) -> List[Node]:
         """Extract table nodes if enabled."""
-        if not self.table_args or not temp_config._parse_elements.get("tables", True):
+        if not self._tables_enabled(temp_config):
             return []
-        table_args_obj = _table_args_dict_to_model(self.table_args)
-        table_elems = tables.ingest(doc, table_args_obj, verbose=self._verbose)
+        table_elems = tables.ingest(doc, self.table_args_obj, verbose=self._verbose)
         return self._elems_to_nodes(table_elems)
 
+    def _tables_enabled(self, temp_config: Config) -> bool:
+        return bool(self.table_args_obj) and temp_config._parse_elements.get("tables", True)
+
     def _get_table_kwargs(self) -> Optional[Dict]:
         """Get table kwargs if table args present."""
-        if not hasattr(self, 'table_args_obj'):
+        if self.table_args_obj is None:
             return None
         return self.table_args_obj.model_dump()
 
@@ -222,51 +429,145 @@ class DocumentParser:
         ocr: bool = False,
         parse_elements: Optional[Dict[str, bool]] = None,
         embeddings_provider: Optional[Literal["openai", "ollama", "cloudflare"]] = None,
-        batch_size: int = 1
+        batch_size: int = 1,
+        workers: Optional[int] = None,
     ) -> Union[ParsedDocument, List[ParsedDocument]]:
-        """Parse document using configured parser."""
+        """
+        Parse document using configured parser.
+
+        When `file` is a directory (or, with MarkItDown, a ZIP archive), its files are
+        parsed across `workers` processes, defaulting to the CPU count.
+        """
+        file_path, is_dir = self._validate_path(file)
+        return self._parse_validated(
+            file_path, is_dir, ocr, parse_elements, embeddings_provider, batch_size, workers
+        )
+
+    def _parse_validated(
+        self,
+        file_path: Path,
+        is_dir: bool,
+        ocr: bool,
+        parse_elements: Optional[Dict[str, bool]],
+        embeddings_provider: Optional[str],
+        batch_size: int,
+        workers: Optional[int],
+    ) -> Union[ParsedDocument, List[ParsedDocument]]:
+        if is_dir:
+            if self.use_markitdown:
+                return self._process_directory(
+                    self._list_directory(file_path), batch_size, workers
+                )
+            return self._process_pdf_directory(
+                file_path, ocr, parse_elements, embeddings_provider, workers
+            )
+        if self.use_markitdown and file_path.suffix.lower() == ".zip":
+            return self._process_zip(file_path, batch_size, workers)
+
+        if self.result_cache_size <= 0:
+            return self._parse_impl(file_path, ocr, parse_elements, embeddings_provider)
+
+        key = self._result_cache_key(file_path, ocr, parse_elements, embeddings_provider)
+        with self._result_cache_lock:
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                self._result_cache.move_to_end(key)
+        if cached is not None:
+            # callers get their own nodes, so mutating them can't alter the cached result
+            return copy.deepcopy(cached)
+
+        doc = self._parse_impl(file_path, ocr, parse_elements, embeddings_provider)
+        with self._result_cache_lock:
+            self._result_cache[key] = doc
+            while len(self._result_cache) > self.result_cache_size:
+                self._result_cache.popitem(last=False)
+        return copy.deepcopy(doc)
+
+    @staticmethod
+    def _validate_path(file: Union[str, Path]) -> Tuple[Path, bool]:
+        """
+        Fail fast on a missing file or directory, before any parsing work starts. Returns
+        the path and whether it is a directory, from a single `stat`.
+        """
         file_path = Path(file)
-        
-        if self.use_markitdown:
-            if file_path.is_dir():
-                files = list(file_path.glob("*"))
-                return self._process_directory(files, batch_size)
-            elif file_path.suffix.lower() == '.zip':
-                # Extract files from ZIP and process each separately
-                with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                    files = []
-                    for filename in zip_ref.namelist():
-                        # Extract to temporary directory
-                        temp_dir = Path(tempfile.mkdtemp())
-                        extracted_path = temp_dir / Path(filename).name
-                        with zip_ref.open(filename) as source, open(extracted_path, 'wb') as target:
-                            shutil.copyfileobj(source, target)
-                        files.append(extracted_path)
-                    
-                    # Process extracted files
-                    try:
-                        return self._process_directory(files, batch_size)
-                    finally:
-                        # Clean up temp files
-                        shutil.rmtree(temp_dir)
-            
-            nodes, metadata = self.markitdown_parser.parse(file_path)
-            return self._process_markitdown(file_path, nodes, metadata)
-            
-        return self._process_pdfminer(
-            file_path,
-            parse_elements,
+        st = os.stat(file_path)  # raises FileNotFoundError
+        return file_path, stat.S_ISDIR(st.st_mode)
+
+    def _result_cache_key(
+        self,
+        file_path: Path,
+        ocr: bool,
+        parse_elements: Optional[Dict[str, bool]],
+        embeddings_provider: Optional[str],
+    ) -> tuple:
+        digest = hashlib.blake2b(digest_size=16)
+        # one read buffer per call, reused across blocks
+        buf = bytearray(1 << 16)
+        view = memoryview(buf)
+        with open(file_path, "rb", buffering=0) as f:
+            for n in iter(lambda: f.readinto(buf), 0):
+                digest.update(view[:n])
+        return (
+            digest.digest(),
+            file_path.name,
+            ocr,
+            tuple(sorted((parse_elements or {}).items())),
             embeddings_provider,
-            ocr
+            tuple(sorted(config._parse_elements.items())),
+            config._embeddings_provider,
+            # steps appended, swapped or reconfigured after construction invalidate earlier results
+            type(self.processing_pipeline).__qualname__,
+            tuple(map(_step_fingerprint, self.processing_pipeline.transformations)),
+        )
+
+    def clear_result_cache(self) -> None:
+        """Drop every cached parse result."""
+        with self._result_cache_lock:
+            self._result_cache.clear()
+
+    def __getstate__(self) -> Dict:
+        # Locks can't be pickled, and worker processes don't need the cached results
+        state = self.__dict__.copy()
+        del state["_result_cache_lock"]
+        state["_result_cache"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._result_cache_lock = threading.Lock()
+
+    async def aparse(
+        self,
+        file: Union[str, Path],
+        ocr: bool = False,
+        parse_elements: Optional[Dict[str, bool]] = None,
+        embeddings_provider: Optional[Literal["openai", "ollama", "cloudflare"]] = None,
+        batch_size: int = 1,
+        max_concurrency: Optional[int] = None,
+    ) -> Union[ParsedDocument, List[ParsedDocument]]:
+        """
+        Async counterpart of `parse` that doesn't block the event loop.
+
+        When `file` is a directory (MarkItDown only), its files are parsed concurrently on
+        threads, at most `max_concurrency` at a time (defaults to the CPU count).
+        """
+        file_path, is_dir = self._validate_path(file)
+        if self.use_markitdown and is_dir:
+            return await self._aprocess_directory(
+                self._list_directory(file_path), max_concurrency or os.cpu_count() or 1
+            )
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            lambda: self._parse_validated(
+                file_path, is_dir, ocr, parse_elements, embeddings_provider, batch_size, None
+            ),
         )
 
     @staticmethod
     def _elems_to_nodes(
         elems: Union[List[TextElement], List[TableElement], List[ImageElement]],
     ) -> List[Node]:
-        return [
-            Node(
-                elements=(e,),
-            )
-            for e in elems
-        ]
+        node = Node  # local binding avoids a global lookup per element
+        return [node(elements=(e,)) for e in elems]
@@ -1,8 +1,28 @@
+from __future__ import annotations
+
+import importlib
 from enum import Enum
-from typing import Union, Protocol, List
-from .openai import OpenAIEmbeddings, cosine_similarity, EmbeddingModel as OpenAIModel
-from .ollama import OllamaEmbeddings, OllamaModel
-from .cloudflare import CloudflareEmbeddings, CloudflareModel
+from typing import TYPE_CHECKING, Any, Dict, List, Protocol, Tuple, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .openai import (
+        OpenAIEmbeddings,
+        cosine_similarity,
+        cosine_similarity_matrix,
+        EmbeddingModel as OpenAIModel,
+    )
+    from .ollama import OllamaEmbeddings, OllamaModel
+    from .cloudflare import CloudflareEmbeddings, CloudflareModel
+    from .quantization import (
+        EmbeddingDtype,
+        quantize_int8,
+        dequantize_int8,
+        cosine_similarity_int8,
+    )
+
+    EmbeddingModel = Union[OpenAIModel, OllamaModel, CloudflareModel]
 
 class EmbeddingsProvider(str, Enum):
     OPENAI = "openai"
@@ -13,17 +33,56 @@ class EmbeddingsClient(Protocol):
     def embed_many(self, texts: List[str]) -> List[List[float]]:
         ...
 
-EmbeddingModel = Union[
-    OpenAIModel, OllamaModel, CloudflareModel
-]
+class ArrayEmbeddingsClient(EmbeddingsClient, Protocol):
+    def embed_many_array(self, texts: List[str]) -> np.ndarray:
+        ...
+
+# Clients pull in requests/backoff/openai, so they're only imported on first access (PEP 562)
+_LAZY_IMPORTS: Dict[str, Tuple[str, str]] = {
+    'OpenAIEmbeddings': ('.openai', 'OpenAIEmbeddings'),
+    'cosine_similarity': ('.openai', 'cosine_similarity'),
+    'cosine_similarity_matrix': ('.openai', 'cosine_similarity_matrix'),
+    'OpenAIModel': ('.openai', 'EmbeddingModel'),
+    'OllamaEmbeddings': ('.ollama', 'OllamaEmbeddings'),
+    'OllamaModel': ('.ollama', 'OllamaModel'),
+    'CloudflareEmbeddings': ('.cloudflare', 'CloudflareEmbeddings'),
+    'CloudflareModel': ('.cloudflare', 'CloudflareModel'),
+    'EmbeddingDtype': ('.quantization', 'EmbeddingDtype'),
+    'quantize_int8': ('.quantization', 'quantize_int8'),
+    'dequantize_int8': ('.quantization', 'dequantize_int8'),
+    'cosine_similarity_int8': ('.quantization', 'cosine_similarity_int8'),
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name == 'EmbeddingModel':
+        value: Any = Union[
+            __getattr__('OpenAIModel'),
+            __getattr__('OllamaModel'),
+            __getattr__('CloudflareModel'),
+        ]
+    elif name in _LAZY_IMPORTS:
+        module_name, attr = _LAZY_IMPORTS[name]
+        value = getattr(importlib.import_module(module_name, __name__), attr)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'OpenAIEmbeddings',
-    'OllamaEmbeddings', 
+    'OllamaEmbeddings',
     'cosine_similarity',
+    'cosine_similarity_matrix',
     'EmbeddingModel',
     'EmbeddingsProvider',
     'EmbeddingsClient',
+    'ArrayEmbeddingsClient',
     'CloudflareEmbeddings',
     'CloudflareModel',
-]
\ No newline at end of file
+    'EmbeddingDtype',
+    'quantize_int8',
+    'dequantize_int8',
+    'cosine_similarity_int8',
+]
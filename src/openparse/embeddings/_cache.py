@@ -0,0 +1,165 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ._disk_cache import DiskEmbeddingCache, cache_path_from_env, cache_ttl_from_env
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class EmbeddingCache:
+    """
+    Bounded in-memory LRU cache of embeddings keyed by a hash of the text.
+
+    Args:
+        maxsize (int): Maximum number of embeddings to keep. 0 disables caching.
+        namespace (str): Mixed into every key, typically the model name, so vectors from
+            different models never collide.
+        disk (DiskEmbeddingCache | None): Optional persistent layer consulted on in-memory misses
+            and written through on every fill.
+        normalize (bool): Key on the text with whitespace runs collapsed and ends stripped, so
+            chunks that differ only in spacing or trailing newlines share one embedding.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 16384,
+        namespace: str = "",
+        disk: Optional[DiskEmbeddingCache] = None,
+        normalize: bool = False,
+    ):
+        self.maxsize = maxsize
+        self.namespace = namespace
+        self.disk = disk
+        self.normalize = normalize
+        # Vectors are stored as tuples and handed out as fresh lists, so callers mutating their
+        # result can't corrupt the cache (shared across every client of the model)
+        self._store: "OrderedDict[bytes, Tuple[float, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, text: str) -> bytes:
+        if self.normalize:
+            text = _WHITESPACE.sub(" ", text).strip()
+        return hashlib.blake2b(
+            f"{self.namespace}\0{text}".encode(), digest_size=16
+        ).digest()
+
+    def get(self, text: str) -> Optional[List[float]]:
+        k = self.key(text)
+        with self._lock:
+            embedding = self._store.get(k)
+            if embedding is not None:
+                self._store.move_to_end(k)
+        return list(embedding) if embedding is not None else None
+
+    def put(self, text: str, embedding: List[float]) -> None:
+        if self.maxsize <= 0:
+            return
+        k = self.key(text)
+        with self._lock:
+            self._store[k] = tuple(embedding)
+            self._store.move_to_end(k)
+            while len(self._store) > self.maxsize:
+                self._store.popitem(last=False)
+
+    def get_or_embed(
+        self,
+        texts: List[str],
+        embed: Callable[[List[str]], List[List[float]]],
+    ) -> List[List[float]]:
+        """
+        Return embeddings for `texts` in order, calling `embed` only for cache misses.
+
+        Duplicate misses are embedded once and scattered back to every position they occur at.
+        """
+        res, misses = self._lookup(texts)
+        if misses:
+            self._fill(texts, res, misses, embed(misses))
+        return res  # type: ignore[return-value]
+
+    async def aget_or_embed(
+        self,
+        texts: List[str],
+        aembed: Callable[[List[str]], Awaitable[List[List[float]]]],
+    ) -> List[List[float]]:
+        """Async counterpart of `get_or_embed`."""
+        res, misses = self._lookup(texts)
+        if misses:
+            self._fill(texts, res, misses, await aembed(misses))
+        return res  # type: ignore[return-value]
+
+    def _lookup(
+        self, texts: List[str]
+    ) -> Tuple[List[Optional[List[float]]], List[str]]:
+        res = [self.get(text) for text in texts]
+        if self.disk is not None and any(emb is None for emb in res):
+            self._lookup_disk(texts, res)
+        misses = list(
+            dict.fromkeys(text for text, emb in zip(texts, res) if emb is None)
+        )
+        return res, misses
+
+    def _lookup_disk(self, texts: List[str], res: List[Optional[List[float]]]) -> None:
+        assert self.disk is not None
+        keys = {i: self.key(text) for i, text in enumerate(texts) if res[i] is None}
+        stored = self.disk.get_many(list(dict.fromkeys(keys.values())))
+        for i, k in keys.items():
+            embedding = stored.get(k)
+            if embedding is not None:
+                res[i] = list(embedding)
+                self.put(texts[i], embedding)
+
+    def _fill(
+        self,
+        texts: List[str],
+        res: List[Optional[List[float]]],
+        misses: List[str],
+        embeddings: List[List[float]],
+    ) -> None:
+        fetched = dict(zip(misses, embeddings))
+        for text, embedding in fetched.items():
+            self.put(text, embedding)
+        if self.disk is not None:
+            self.disk.put_many({self.key(text): emb for text, emb in fetched.items()})
+        for i, text in enumerate(texts):
+            if res[i] is None:
+                # a copy per position, so duplicate texts don't share one list
+                res[i] = list(fetched[text])
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+_shared_caches: Dict[Tuple[str, bool], EmbeddingCache] = {}
+_shared_caches_lock = threading.Lock()
+
+
+def shared_cache(namespace: str, maxsize: int, normalize: bool = False) -> EmbeddingCache:
+    """
+    Process-wide cache for `namespace`, so every client created for the same provider and
+    model reuses the others' embeddings. The cache grows to the largest `maxsize` requested;
+    a `maxsize` of 0 returns a private, disabled cache.
+
+    When `OPENPARSE_EMBEDDINGS_CACHE` is set, the cache is also backed by a SQLite file so
+    embeddings survive restarts (see `DiskEmbeddingCache`); `OPENPARSE_EMBEDDINGS_CACHE_TTL`
+    sets how many seconds its rows stay valid.
+    """
+    if maxsize <= 0:
+        return EmbeddingCache(maxsize=0, namespace=namespace)
+    with _shared_caches_lock:
+        cache = _shared_caches.get((namespace, normalize))
+        if cache is None:
+            path = cache_path_from_env()
+            disk = (
+                DiskEmbeddingCache(path, namespace, cache_ttl_from_env())
+                if path is not None
+                else None
+            )
+            cache = _shared_caches[namespace, normalize] = EmbeddingCache(
+                maxsize, namespace, disk, normalize
+            )
+        else:
+            cache.maxsize = max(cache.maxsize, maxsize)
+    return cache
@@ -0,0 +1,135 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+# Set to a file path (or "1" for the default location) to persist embeddings across runs
+CACHE_ENV_VAR = "OPENPARSE_EMBEDDINGS_CACHE"
+DEFAULT_CACHE_PATH = Path("~/.cache/openparse/embeddings.sqlite")
+# Optional row lifetime in seconds for the persistent cache; unset keeps rows forever
+CACHE_TTL_ENV_VAR = "OPENPARSE_EMBEDDINGS_CACHE_TTL"
+
+# Stay well under SQLite's default limit on bound parameters
+_MAX_VARIABLES = 500
+
+
+class DiskEmbeddingCache:
+    """
+    Embeddings persisted in a SQLite file, so they survive process restarts.
+
+    Rows are keyed by the same content hash as the in-memory `EmbeddingCache` (which already
+    mixes in the provider and model) and store the vector as raw float32 bytes.
+
+    Args:
+        path (str | Path): Location of the SQLite file, created if missing.
+        namespace (str): Provider/model the rows belong to, kept for housekeeping.
+        ttl (float | None): Seconds after which a row is treated as a miss. None keeps rows forever.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        namespace: str = "",
+        ttl: Optional[float] = None,
+    ):
+        self.path = Path(path).expanduser()
+        self.namespace = namespace
+        self.ttl = ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        # WAL lets several test or worker processes read while one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS emb ("
+            "k BLOB PRIMARY KEY, namespace TEXT NOT NULL, v BLOB NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, List[float]]:
+        """Embeddings for whichever of `keys` are stored and not expired."""
+        found: Dict[bytes, List[float]] = {}
+        min_created = time.time() - self.ttl if self.ttl is not None else float("-inf")
+        with self._lock:
+            for i in range(0, len(keys), _MAX_VARIABLES):
+                chunk = keys[i : i + _MAX_VARIABLES]
+                rows = self._conn.execute(
+                    f"SELECT k, v FROM emb WHERE created_at >= ? AND k IN ({','.join('?' * len(chunk))})",
+                    (min_created, *chunk),
+                ).fetchall()
+                vectors = _decode_rows([v for _, v in rows])
+                found.update(zip((bytes(k) for k, _ in rows), vectors))
+        return found
+
+    def get(self, key: bytes) -> Optional[List[float]]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Dict[bytes, List[float]]) -> None:
+        now = time.time()
+        rows = [
+            (k, self.namespace, blob, now)
+            for k, blob in zip(items, _encode_rows(list(items.values())))
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO emb (k, namespace, v, created_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def put(self, key: bytes, embedding: List[float]) -> None:
+        self.put_many({key: embedding})
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _encode_rows(vectors: List[List[float]]) -> List[bytes]:
+    """Vectors as float32 blobs, converting same-sized vectors with a single array."""
+    if not vectors:
+        return []
+    try:
+        arr = np.asarray(vectors, dtype=np.float32)
+    except ValueError:  # ragged
+        return [np.asarray(v, dtype=np.float32).tobytes() for v in vectors]
+    return [row.tobytes() for row in arr.reshape(len(vectors), -1)]
+
+
+def _decode_rows(blobs: List[bytes]) -> List[List[float]]:
+    """float32 blobs back to lists, decoding same-sized rows with a single `frombuffer`."""
+    if not blobs:
+        return []
+    size = len(blobs[0])
+    if size and all(len(blob) == size for blob in blobs):
+        arr = np.frombuffer(b"".join(blobs), dtype=np.float32)
+        return arr.reshape(len(blobs), -1).tolist()
+    return [np.frombuffer(blob, dtype=np.float32).tolist() for blob in blobs]
+
+
+def cache_path_from_env() -> Optional[Path]:
+    """The persistent cache location configured through `OPENPARSE_EMBEDDINGS_CACHE`, if any."""
+    value = os.environ.get(CACHE_ENV_VAR, "").strip()
+    if not value or value.lower() in ("0", "false", "no"):
+        return None
+    if value.lower() in ("1", "true", "yes"):
+        return DEFAULT_CACHE_PATH.expanduser()
+    return Path(value).expanduser()
+
+
+def cache_ttl_from_env() -> Optional[float]:
+    """The row lifetime configured through `OPENPARSE_EMBEDDINGS_CACHE_TTL`, if any."""
+    value = os.environ.get(CACHE_TTL_ENV_VAR, "").strip()
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError as err:
+        raise ValueError(
+            f"❌ {CACHE_TTL_ENV_VAR} must be a number of seconds, got {value!r}."
+        ) from err
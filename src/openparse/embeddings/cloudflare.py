@@ -1,11 +1,12 @@
-import time
 import logging
+import numpy as np
 from typing import List, Literal
-import requests
 from requests.exceptions import RequestException, SSLError
 import backoff
-from urllib3.util.retry import Retry
-from requests.adapters import HTTPAdapter
+
+from ._cache import shared_cache
+from ._http import JSON_HEADERS, dumps, get_session, loads
+from .quantization import EmbeddingDtype, cast_embeddings
 
 # Logger setup
 cf_logger = logging.getLogger('cloudflare')
@@ -28,6 +29,10 @@ class CloudflareEmbeddings:
         batch_size: int = 100,
         max_retries: int = 3,
         retry_delay: int = 2,
+        cache_size: int = 16384,
+        fuzzy_cache: bool = False,
+        dtype: EmbeddingDtype = "fp16",
+        verify_connection: bool = False,
         **kwargs
     ):
         api_token = kwargs.get('api_token', None)
@@ -45,104 +50,98 @@ class CloudflareEmbeddings:
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.base_url = f"https://api.cloudflare.com/client/v4/accounts/{self.account_id}/ai/run"
+        self._cache = shared_cache(f"cloudflare:{model}", cache_size, fuzzy_cache)
+        self.dtype = dtype
         
-        # Create session after setting variables
-        self.session = self._create_session()
-        
-        # Test connection
-        self._check_connection()
+        # Shared pooled session; credentials travel per request so they don't leak across clients
+        self.session = get_session()
+        self._headers = {**JSON_HEADERS, "Authorization": f"Bearer {self.api_token}"}
         
+        # Optional connection probe; transient failures are retried by the session adapter
+        if verify_connection:
+            self._check_connection()
+
     def _check_connection(self) -> None:
         """Test connection to Cloudflare API"""
-        headers = {
-            "Authorization": f"Bearer {self.api_token}",
-            "Content-Type": "application/json"
-        }
-        
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.get(
-                    f"https://api.cloudflare.com/client/v4/accounts/{self.account_id}",
-                    headers=headers
-                )
-                response.raise_for_status()
-                return
-            except RequestException as e:
-                if attempt == self.max_retries - 1:
-                    raise ConnectionError(f"❌ Failed to connect to Cloudflare API: {str(e)}")
-                time.sleep(self.retry_delay)
-
-    def _create_session(self):
-        session = requests.Session()
-        retry_strategy = Retry(
-            total=5,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(
-            max_retries=retry_strategy,
-            pool_connections=10,
-            pool_maxsize=10
-        )
-        session.mount("https://", adapter)
-        session.headers.update({
-            "Authorization": f"Bearer {self.api_token}",
-            "Content-Type": "application/json"
-        })
-        return session
+        try:
+            response = self.session.get(
+                f"https://api.cloudflare.com/client/v4/accounts/{self.account_id}",
+                headers=self._headers,
+                timeout=5
+            )
+            response.raise_for_status()
+        except RequestException as e:
+            raise ConnectionError(f"❌ Failed to connect to Cloudflare API: {str(e)}")
 
     @backoff.on_exception(
         backoff.expo,
         (RequestException, SSLError),
         max_tries=5
     )
-
-    def _get_embedding(self, text: str) -> List[float]:
+    def _get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts with a single request to the Workers AI endpoint."""
         try:
-            text_preview = text[:50] + "..." if len(text) > 50 else text
-            cf_logger.info(f"Embedding text: {text_preview}")
-            
+            cf_logger.info("Embedding batch of %d texts", len(texts))
+
             response = self.session.post(
                 f"{self.base_url}/{self.model}",
-                json={"text": text},
+                data=dumps({"text": texts}),
+                headers=self._headers,
                 timeout=30,
                 verify=True
             )
-            
+
             if response.status_code != 200:
                 cf_logger.error(f"Error response: {response.text}")
-            
+
             response.raise_for_status()
-            json = response.json()
-            
+            json = loads(response.content)
+
             if json.get('success') is not True:
                 raise ValueError(f"❌ Error from Cloudflare API: {json.get('errors')}")
 
             result = json.get('result')
             if not result:
                 raise ValueError(f"❌ Unexpected response format: {json}")
-            dataList = result.get('data')
-            if not dataList:
-                raise ValueError(f"❌ Unexpected response format: {json}")
-            data = dataList[0]
-            if not data:
+            data = result.get('data')
+            if not data or len(data) != len(texts):
                 raise ValueError(f"❌ Unexpected response format: {json}")
 
             return data
-            
+
         except Exception as e:
             cf_logger.error(f"Failed: {str(e)}")
             raise
 
-    def embed_many(self, texts: List[str]) -> List[List[float]]:
+    def _embed_uncached(self, texts: List[str]) -> List[List[float]]:
         res = []
+        for i in range(0, len(texts), self.batch_size):
+            batch_texts = texts[i:i + self.batch_size]
+            res.extend(self._get_embeddings_batch(batch_texts))
+        return res
+
+    def embed_many(self, texts: List[str]) -> List[List[float]]:
         non_empty_texts = [text for text in texts if text]
+        res = self._cache.get_or_embed(non_empty_texts, self._embed_uncached)
+
+        # Zero embeddings for empty texts, kept at their original position
+        embedding_size = len(res[0]) if res else 768  # BGE base size
+        embeddings = iter(res)
+        return [next(embeddings) if text else [0.0] * embedding_size for text in texts]
+
+    def embed_many_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Like `embed_many`, but returns a contiguous array of shape (len(texts), dim)
+        stored as `self.dtype`. For int8, use `quantize_int8` on fp32 output if you need
+        the per-row scales.
 
-        for i in range(0, len(non_empty_texts), self.batch_size):
-            batch_texts = non_empty_texts[i:i + self.batch_size]
-            batch_embeddings = [self._get_embedding(text) for text in batch_texts]
-            res.extend(batch_embeddings)
+        Empty texts keep their position and get an all-zero row.
+        """
+        idxs = [i for i, text in enumerate(texts) if text]
+        res = self._cache.get_or_embed([texts[i] for i in idxs], self._embed_uncached)
 
-        # Pad empty texts with zeros
         embedding_size = len(res[0]) if res else 768  # BGE base size
-        return res + [[0.0] * embedding_size] * (len(texts) - len(non_empty_texts))
\ No newline at end of file
+        out = np.zeros((len(texts), embedding_size), dtype=np.float32)
+        if res:
+            out[idxs] = res
+        return cast_embeddings(out, self.dtype)
@@ -1,10 +1,15 @@
 import os
-import time
-import requests
 import logging
+import numpy as np
 
-from typing import List, Literal, Optional
-from requests.exceptions import RequestException
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Literal, Optional, Tuple
+from requests.exceptions import HTTPError, RequestException
+
+from ._cache import shared_cache
+from ._http import JSON_HEADERS, dumps, get_session, loads
+from .ollama_async import AsyncOllamaMixin
+from .quantization import EmbeddingDtype, cast_embeddings
 
 # Create custom logger for Ollama
 ollama_logger = logging.getLogger('ollama')
@@ -16,14 +21,23 @@ ollama_logger.addHandler(handler)
 
 OllamaModel = Literal["bge-large", "nomic-embed-text"]
 
+# Embedding dimension per (api_url, model), shared by every client in the process
+_DIMENSIONS: Dict[Tuple[str, str], int] = {}
+
 
-class OllamaEmbeddings:
+class OllamaEmbeddings(AsyncOllamaMixin):
     def __init__(
         self,
         model: OllamaModel = "bge-large",
         batch_size: int = 256,
         max_retries: int = 3,
         retry_delay: int = 2,
+        cache_size: int = 16384,
+        fuzzy_cache: bool = False,
+        dtype: EmbeddingDtype = "fp16",
+        verify_connection: bool = False,
+        max_workers: int = 16,
+        timeout: Optional[float] = None,
 
         **kwargs
 
@@ -36,63 +50,143 @@ class OllamaEmbeddings:
         self.batch_size = batch_size
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self._check_connection()
+        # Requests are latency-bound, so a batch is sent over concurrent keep-alive connections
+        self.max_workers = max_workers
+        # Seconds to wait on a request; a batch of a few hundred texts on CPU can take minutes
+        self.timeout = timeout
+        self._cache = shared_cache(f"ollama:{self.api_url}:{model}", cache_size, fuzzy_cache)
+        self.dtype = dtype
+        self.session = get_session()
+        # Cleared the first time the server turns out to predate the batch /api/embed route
+        self._batch_endpoint = True
+
+        # Optional connection probe; transient failures are retried by the session adapter
+        if verify_connection:
+            self._check_connection()
 
     def _check_connection(self) -> None:
         """Test connection to Ollama service"""
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.get(f"{self.api_url}/api/tags")
-                response.raise_for_status()
-                return
-            except RequestException as e:
-                if attempt == self.max_retries - 1:
-                    raise ConnectionError(
-                        f"❌ Failed to connect to Ollama API at {self.api_url}. "
-                        f"❌ Error: {str(e)}"
-                    )
-                time.sleep(self.retry_delay)
+        try:
+            response = self.session.get(f"{self.api_url}/api/tags", timeout=5)
+            response.raise_for_status()
+        except RequestException as e:
+            raise ConnectionError(
+                f"❌ Failed to connect to Ollama API at {self.api_url}. "
+                f"❌ Error: {str(e)}"
+            )
+
+    @property
+    def dimension(self) -> int:
+        """
+        Size of this model's embeddings. Probes the server only the first time a given
+        (api_url, model) pair is seen in the process.
+        """
+        key = (self.api_url, self.model)
+        if key not in _DIMENSIONS:
+            _DIMENSIONS[key] = len(self._embed_batch(["dimension probe"])[0])
+        return _DIMENSIONS[key]
+
+    def _embedding_size(self, res: List[List[float]]) -> int:
+        """Size for zero embeddings; learned from `res` when possible, without a probe."""
+        key = (self.api_url, self.model)
+        if res:
+            _DIMENSIONS[key] = len(res[0])
+            return len(res[0])
+        return _DIMENSIONS.get(key, 1)
 
     def _get_embedding(self, text: str) -> List[float]:
         try:
-            text_preview = text[:50] + "..." if len(text) > 50 else text
-            # ollama_logger.info(f"🤖 Embedding model: {self.model}")
-            # ollama_logger.info(f"📄 Embedding text: {text_preview}")
-            
             payload = {
                 "model": self.model,
                 "prompt": text
             }
-            ollama_logger.info(f"🌐 Request to: {self.api_url}/api/embeddings")
+            if ollama_logger.isEnabledFor(logging.DEBUG):
+                ollama_logger.debug("🌐 Request to: %s/api/embeddings", self.api_url)
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_url}/api/embeddings",
-                json=payload
+                data=dumps(payload),
+                headers=JSON_HEADERS,
+                timeout=self.timeout
             )
             
             if response.status_code != 200:
-                ollama_logger.error(f"❌ Error response: {response.text}")
+                ollama_logger.error("❌ Error response: %s", response.text)
                 
             response.raise_for_status()
-            result = response.json()
+            result = loads(response.content)
             
             if 'embedding' not in result:
                 raise ValueError(f"❌ Unexpected response format: {result}")
                 
             return result['embedding']
         except Exception as e:
-            ollama_logger.error(f"❌ Failed: {str(e)}")
+            ollama_logger.error("❌ Failed: %s", e)
             raise
     
-    def embed_many(self, texts: List[str]) -> List[List[float]]:
+    def _get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a whole batch in one call to the /api/embed route (Ollama >= 0.3)."""
+        if ollama_logger.isEnabledFor(logging.DEBUG):
+            ollama_logger.debug(
+                "🌐 Request to: %s/api/embed (%d texts)", self.api_url, len(texts)
+            )
+
+        response = self.session.post(
+            f"{self.api_url}/api/embed",
+            data=dumps({"model": self.model, "input": texts}),
+            headers=JSON_HEADERS,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        result = loads(response.content)
+
+        embeddings = result.get("embeddings")
+        if embeddings is None or len(embeddings) != len(texts):
+            raise ValueError(f"❌ Unexpected response format: {result}")
+        return embeddings
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        if self._batch_endpoint:
+            try:
+                return self._get_embeddings_batch(texts)
+            except HTTPError as e:
+                if e.response is None or e.response.status_code != 404:
+                    raise
+                ollama_logger.info(
+                    "⚠️ /api/embed not available, falling back to /api/embeddings"
+                )
+                self._batch_endpoint = False
+        with ThreadPoolExecutor(max_workers=min(len(texts), self.max_workers)) as executor:
+            return list(executor.map(self._get_embedding, texts))
+
+    def _embed_uncached(self, texts: List[str]) -> List[List[float]]:
         res = []
+        for i in range(0, len(texts), self.batch_size):
+            res.extend(self._embed_batch(texts[i : i + self.batch_size]))
+        return res
+
+    def embed_many(self, texts: List[str]) -> List[List[float]]:
         non_empty_texts = [text for text in texts if text]
+        res = self._cache.get_or_embed(non_empty_texts, self._embed_uncached)
+
+        # Zero embeddings for empty texts, kept at their original position
+        embedding_size = self._embedding_size(res)
+        embeddings = iter(res)
+        return [next(embeddings) if text else [0.0] * embedding_size for text in texts]
+
+    def embed_many_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Like `embed_many`, but returns a contiguous array of shape (len(texts), dim)
+        stored as `self.dtype`. For int8, use `quantize_int8` on fp32 output if you need
+        the per-row scales.
 
-        for i in range(0, len(non_empty_texts), self.batch_size):
-            batch_texts = non_empty_texts[i : i + self.batch_size]
-            batch_embeddings = [self._get_embedding(text) for text in batch_texts]
-            res.extend(batch_embeddings)
+        Empty texts keep their position and get an all-zero row.
+        """
+        idxs = [i for i, text in enumerate(texts) if text]
+        res = self._cache.get_or_embed([texts[i] for i in idxs], self._embed_uncached)
 
-        # Pad empty texts with zeros
-        embedding_size = len(res[0]) if res else 1
-        return res + [[0.0] * embedding_size] * (len(texts) - len(non_empty_texts))
\ No newline at end of file
+        embedding_size = self._embedding_size(res)
+        out = np.zeros((len(texts), embedding_size), dtype=np.float32)
+        if res:
+            out[idxs] = res
+        return cast_embeddings(out, self.dtype)
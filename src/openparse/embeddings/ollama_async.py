@@ -0,0 +1,160 @@
+import asyncio
+from typing import TYPE_CHECKING, Any, List, Optional
+
+from ._cache import EmbeddingCache
+from ._http import JSON_HEADERS, dumps, loads
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _import_aiohttp():
+    try:
+        import aiohttp
+    except ImportError as err:
+        raise ImportError(
+            "You need to install the aiohttp package to use async embeddings."
+        ) from err
+    return aiohttp
+
+
+async def _close_when_cancelled(session) -> None:
+    """
+    Park until cancelled, then close `session` from inside its own loop. `asyncio.run`
+    cancels pending tasks before closing the loop, so sessions don't outlive it.
+    """
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await session.close()
+
+
+class AsyncOllamaMixin:
+    """
+    aiohttp-based async methods for `OllamaEmbeddings`.
+
+    Requests go over one keep-alive session per client, opened on first use and reused for
+    every later call on the same event loop, so TCP connections are amortized across calls.
+    Call `aclose` when done with the client.
+    """
+
+    # Provided by OllamaEmbeddings
+    model: str
+    api_url: str
+    batch_size: int
+    max_workers: int
+    timeout: Optional[float]
+    max_retries: int
+    retry_delay: int
+    _cache: EmbeddingCache
+    _batch_endpoint: bool
+
+    if TYPE_CHECKING:
+
+        def _embedding_size(self, res: List[List[float]]) -> int: ...
+
+    _asession: Any = None
+    _asession_loop: Optional[asyncio.AbstractEventLoop] = None
+    _asession_closer: "Optional[asyncio.Task[None]]" = None
+
+    async def aembed_many(self, texts: List[str]) -> List[List[float]]:
+        """
+        Async counterpart of `embed_many`. Batches are sent concurrently, so callers already
+        running an event loop aren't blocked on the network.
+        """
+        non_empty_texts = [text for text in texts if text]
+        res = await self._cache.aget_or_embed(non_empty_texts, self._aembed_uncached)
+
+        embedding_size = self._embedding_size(res)
+        embeddings = iter(res)
+        return [next(embeddings) if text else [0.0] * embedding_size for text in texts]
+
+    async def aclose(self) -> None:
+        """Close the async session, if one is open."""
+        session = self._asession
+        if self._asession_loop is not asyncio.get_running_loop():
+            self._release_asession()
+            return
+        self._release_asession()
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _get_asession(self):
+        # aiohttp sessions are bound to the loop they were created on
+        loop = asyncio.get_running_loop()
+        if self._asession_loop is not loop:
+            self._release_asession()
+        if self._asession is None or self._asession.closed:
+            aiohttp = _import_aiohttp()
+            self._asession = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_workers),
+                headers=JSON_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._asession_loop = loop
+            self._asession_closer = loop.create_task(_close_when_cancelled(self._asession))
+        return self._asession
+
+    def _release_asession(self) -> None:
+        """Drop the current session, closing it on its own loop if that loop is still alive."""
+        closer, loop = self._asession_closer, self._asession_loop
+        self._asession = self._asession_loop = self._asession_closer = None
+        if closer is not None and loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(closer.cancel)
+
+    async def _aembed_uncached(self, texts: List[str]) -> List[List[float]]:
+        session = self._get_asession()
+        batches = await asyncio.gather(
+            *(
+                self._aembed_batch(session, texts[i : i + self.batch_size])
+                for i in range(0, len(texts), self.batch_size)
+            )
+        )
+        return [embedding for batch in batches for embedding in batch]
+
+    async def _aembed_batch(self, session, texts: List[str]) -> List[List[float]]:
+        aiohttp = _import_aiohttp()
+        if self._batch_endpoint:
+            try:
+                result = await self._apost(
+                    session, "/api/embed", {"model": self.model, "input": texts}
+                )
+                embeddings = result.get("embeddings")
+                if embeddings is None or len(embeddings) != len(texts):
+                    raise ValueError(f"❌ Unexpected response format: {result}")
+                return embeddings
+            except aiohttp.ClientResponseError as e:
+                if e.status != 404:
+                    raise
+                self._batch_endpoint = False
+
+        results = await asyncio.gather(
+            *(
+                self._apost(
+                    session, "/api/embeddings", {"model": self.model, "prompt": text}
+                )
+                for text in texts
+            )
+        )
+        for result in results:
+            if "embedding" not in result:
+                raise ValueError(f"❌ Unexpected response format: {result}")
+        return [result["embedding"] for result in results]
+
+    async def _apost(self, session, path: str, payload: dict) -> dict:
+        """POST with retries on connection errors and 429/5xx, backing off without blocking the loop."""
+        aiohttp = _import_aiohttp()
+        url = f"{self.api_url}{path}"
+        data = dumps(payload)
+        for attempt in range(self.max_retries):
+            try:
+                async with session.post(url, data=data) as response:
+                    if response.status not in _RETRY_STATUSES:
+                        response.raise_for_status()
+                        return loads(await response.read())
+            except aiohttp.ClientConnectionError:
+                pass
+            await asyncio.sleep(self.retry_delay * 2**attempt)
+
+        async with session.post(url, data=data) as response:
+            response.raise_for_status()
+            return loads(await response.read())
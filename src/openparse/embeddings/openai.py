@@ -1,15 +1,57 @@
+import importlib.util
 from typing import List, Literal, Union, Optional
 
 import numpy as np
 
+from ._cache import shared_cache
+
+try:
+    import simsimd
+except ImportError:  # optional speedup, fall back to NumPy
+    simsimd = None  # type: ignore[assignment]
+
 EmbeddingModel = Literal[
     "text-embedding-3-large", "text-embedding-3-small", "text-embedding-ada-002"
 ]
 
+def cosine_similarity_matrix(
+    a: Union[np.ndarray, List[List[float]]], b: Union[np.ndarray, List[List[float]]]
+) -> np.ndarray:
+    """
+    Pairwise cosine similarities between the rows of `a` and `b`, computed with a single matmul.
+    """
+    a = np.atleast_2d(np.asarray(a, dtype=np.float32))
+    b = np.atleast_2d(np.asarray(b, dtype=np.float32))
+    norms = np.linalg.norm(a, axis=1)[:, np.newaxis] * np.linalg.norm(b, axis=1)
+    return (a @ b.T) / norms
+
+
 def cosine_similarity(
     a: Union[np.ndarray, List[float]], b: Union[np.ndarray, List[float]]
-) -> float:
-    return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+) -> Union[float, np.ndarray]:
+    """
+    Cosine similarity between two vectors, or between the rows of 2-D inputs.
+
+    Returns a float when both inputs are 1-D, otherwise an array of similarities. Half-precision
+    and int8 inputs are upcast to float32 for the computation.
+    """
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+    if a.ndim == 1 and b.ndim == 1 and simsimd is not None:
+        # SimSIMD reports two zero vectors as identical; keep NumPy's nan for zero norms
+        if not a.any() or not b.any():
+            return float("nan")
+        return 1.0 - float(
+            simsimd.cosine(np.ascontiguousarray(a), np.ascontiguousarray(b))
+        )
+    if a.ndim == 1 and b.ndim == 1:
+        return float(np.dot(a, b) / np.sqrt(np.vdot(a, a) * np.vdot(b, b)))
+    sims = cosine_similarity_matrix(a, b)
+    if a.ndim == 1:
+        return sims[0]
+    if b.ndim == 1:
+        return sims[:, 0]
+    return sims
 
 
 class OpenAIEmbeddings:
@@ -19,6 +61,8 @@ class OpenAIEmbeddings:
         batch_size: int = 256,
         max_retries: int = 3,
         retry_delay: int = 2,
+        cache_size: int = 16384,
+        fuzzy_cache: bool = False,
 
         **kwargs
     ):
@@ -34,32 +78,33 @@ class OpenAIEmbeddings:
             api_key (str): Your OpenAI API key.
             model (str): The embedding model to use.
             batch_size (int): The number of texts to process in each api call.
+            cache_size (int): Number of embeddings kept in memory. 0 disables caching.
+            fuzzy_cache (bool): Ignore whitespace differences when looking texts up in the cache.
         """
         self.api_key = api_key
         self.model = model
         self.batch_size = batch_size
+        self._cache = shared_cache(f"openai:{model}", cache_size, fuzzy_cache)
         self.client = self._create_client()
 
-    def embed_many(self, texts: List[str]) -> List[List[float]]:
-        res = []
-        non_empty_texts = [text for text in texts if text]
-
-        embedding_size = 1
-        for i in range(0, len(non_empty_texts), self.batch_size):
-            batch_texts = non_empty_texts[i : i + self.batch_size]
+    def _embed_uncached(self, texts: List[str]) -> List[List[float]]:
+        res: List[List[float]] = []
+        for i in range(0, len(texts), self.batch_size):
+            batch_texts = texts[i : i + self.batch_size]
             api_resp = self.client.embeddings.create(
                 input=batch_texts, model=self.model
             )
-            batch_res = [val.embedding for val in api_resp.data]
-            res.extend(batch_res)
-            embedding_size = len(batch_res[0])
+            res.extend(val.embedding for val in api_resp.data)
+        return res
 
-        # Map results back to original indices, adding zero embeddings for empty texts
-        final_res = [
-            [0.0] * embedding_size if not text else res.pop(0) for text in texts
-        ]
+    def embed_many(self, texts: List[str]) -> List[List[float]]:
+        non_empty_texts = [text for text in texts if text]
+        res = self._cache.get_or_embed(non_empty_texts, self._embed_uncached)
 
-        return final_res
+        # Zero embeddings for empty texts, kept at their original position
+        embedding_size = len(res[0]) if res else 1
+        embeddings = iter(res)
+        return [next(embeddings) if text else [0.0] * embedding_size for text in texts]
 
     def _create_client(self):
         try:
@@ -68,4 +113,21 @@ class OpenAIEmbeddings:
             raise ImportError(
                 "You need to install the openai package to use this feature."
             ) from err
-        return OpenAI(api_key=self.api_key)
+        return OpenAI(api_key=self.api_key, http_client=self._create_http_client())
+
+    @staticmethod
+    def _create_http_client():
+        """
+        Keep-alive pool sized for bursts of batch requests, over HTTP/2 when `h2` is installed.
+        Returns None, i.e. the openai default, if httpx isn't importable.
+        """
+        try:
+            import httpx
+            from openai import DefaultHttpxClient
+        except ImportError:
+            return None
+        return DefaultHttpxClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=httpx.Timeout(60.0),
+        )
@@ -0,0 +1,62 @@
+from typing import List, Literal, Tuple, Union
+
+import numpy as np
+
+from .openai import cosine_similarity
+
+EmbeddingDtype = Literal["fp32", "fp16", "bf16", "int8"]
+
+
+def quantize_int8(
+    embeddings: Union[np.ndarray, List[List[float]]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-vector int8 quantization.
+
+    Returns the quantized rows and the per-row scale used, so that `q / scale` recovers
+    an approximation of the original vectors.
+    """
+    arr = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+    max_abs = np.max(np.abs(arr), axis=1, keepdims=True)
+    scales = np.divide(
+        127.0, max_abs, out=np.ones_like(max_abs), where=max_abs > 0
+    )
+    q = np.round(arr * scales).astype(np.int8)
+    return q, scales[:, 0]
+
+
+def dequantize_int8(q: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    q = np.atleast_2d(q)
+    return q.astype(np.float32) / np.asarray(scales, dtype=np.float32)[:, np.newaxis]
+
+
+def cosine_similarity_int8(
+    a_q: np.ndarray, b_q: np.ndarray
+) -> Union[float, np.ndarray]:
+    """
+    Cosine similarity between int8-quantized vectors.
+
+    The per-vector scales cancel out in the cosine, so they aren't needed here.
+    """
+    return cosine_similarity(a_q, b_q)
+
+
+def cast_embeddings(embeddings: np.ndarray, dtype: EmbeddingDtype) -> np.ndarray:
+    """
+    Convert fp32 embeddings to the requested storage dtype.
+    """
+    if dtype == "fp32":
+        return embeddings
+    if dtype == "fp16":
+        return embeddings.astype(np.float16)
+    if dtype == "int8":
+        return quantize_int8(embeddings)[0]
+    if dtype == "bf16":
+        try:
+            import ml_dtypes
+        except ImportError as err:
+            raise ImportError(
+                "You need to install the ml_dtypes package to use bf16 embeddings."
+            ) from err
+        return embeddings.astype(ml_dtypes.bfloat16)
+    raise ValueError(f"❌ Unsupported embedding dtype: {dtype}")
@@ -1,4 +1,4 @@
-from typing import Literal, Union
+from typing import Any, Literal, Union
 from .basic_transforms import (
     CombineBullets,
     CombineHeadingsWithClosestText,
@@ -16,14 +16,30 @@ from .ingest import (
     NoOpIngestionPipeline,
     SemanticIngestionPipeline,
 )
-from .semantic_transforms import CombineNodesSemantically
-from openparse.embeddings.openai import OpenAIEmbeddings, EmbeddingModel as OpenAIModel
-from openparse.embeddings.ollama import OllamaEmbeddings, OllamaModel
-from openparse.embeddings.cloudflare import CloudflareEmbeddings, CloudflareModel
+from .semantic_transforms import CombineNodesSemantically, EmbedNodes
+from openparse import embeddings as _embeddings
 
-EmbeddingModel = Union[OpenAIModel, OllamaModel]
 EmbeddingsProvider = Literal["openai", "ollama", "cloudflare"]
 
+_LAZY_EMBEDDINGS = (
+    "OpenAIEmbeddings",
+    "OllamaEmbeddings",
+    "CloudflareEmbeddings",
+    "CloudflareModel",
+)
+
+
+def __getattr__(name: str) -> Any:
+    # Embedding clients are resolved lazily, see openparse.embeddings
+    if name == "EmbeddingModel":
+        value: Any = Union[_embeddings.OpenAIModel, _embeddings.OllamaModel]
+    elif name in _LAZY_EMBEDDINGS:
+        value = getattr(_embeddings, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
 __all__ = [
     "ProcessingStep",
     "RemoveTextInsideTables",
@@ -39,6 +55,7 @@ __all__ = [
     "NoOpIngestionPipeline",
     "RemoveNodesBelowNTokens",
     "CombineNodesSemantically",
+    "EmbedNodes",
     'OpenAIEmbeddings',
     'OllamaEmbeddings',
     'CloudflareEmbeddings',
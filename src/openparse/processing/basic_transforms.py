@@ -22,6 +22,10 @@ def get_elements_of_type(nodes: List[Node], element_type: Type[E]) -> List[E]:
 
 
 class ProcessingStep(ABC):
+    # Whether `process` may return nodes out of reading order. Steps that only drop nodes set
+    # this to False so the pipeline can skip re-sorting after them.
+    reorders: bool = True
+
     @abstractmethod
     def process(self, nodes: List[Node]) -> List[Node]:
         """
@@ -180,6 +184,8 @@ class RemoveFullPageStubs(ProcessingStep):
     Sometimes elements take up entire pages and are not useful for downstream processing.
     """
 
+    reorders = False
+
     def __init__(self, max_area_pct: float):
         assert 0 <= max_area_pct <= 1, "max_area_pct must be between 0 and 1."
         self.max_area_pct = max_area_pct
@@ -210,6 +216,8 @@ class RemoveMetadataElements(ProcessingStep):
     Looking to remove `page`, `attachment` etc. from the extracted text.  Typically we find this data to be quite challenging to incorporate into the querying stage ("tell me what's on page 6") without adding a lot of complexity to your app.
     """
 
+    reorders = False
+
     def __init__(self, min_y0_pct: float = 0.1, max_y0_pct: float = 0.90):
         self.min_y0_pct = min_y0_pct
         self.max_y0_pct = max_y0_pct
@@ -244,6 +252,8 @@ class RemoveRepeatedElements(ProcessingStep):
     Note duplicates get droppped entirely, not just one of them. This is because typically the data is just metadata and not useful.
     """
 
+    reorders = False
+
     def __init__(self, threshold: int = 2):
         self.threshold = threshold
 
@@ -267,6 +277,8 @@ class RemoveNodesBelowNTokens(ProcessingStep):
     This should be the last step in the pipeline. Stubs are typically small elements that are not useful for downstream processing.
     """
 
+    reorders = False
+
     def __init__(self, min_tokens: int):
         self.min_tokens = min_tokens
 
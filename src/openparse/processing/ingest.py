@@ -1,5 +1,5 @@
 from abc import ABC
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 from openparse import consts
 from openparse.processing.basic_transforms import (
@@ -33,12 +33,16 @@ class IngestionPipeline(ABC):
     transformations: List[ProcessingStep]
     verbose: Optional[bool] = False
 
-    def run(self, nodes: List[Node]) -> List[Node]:
+    def run(self, nodes: Iterable[Node]) -> List[Node]:
         nodes = sorted(nodes)
+        is_sorted = True
         for transform_func in self.transformations:
             if self.verbose:
                 print("Processing with", transform_func.__class__.__name__)
-            nodes = transform_func.process(sorted(nodes))
+            if not is_sorted and len(nodes) > 1:
+                nodes = sorted(nodes)
+            nodes = transform_func.process(nodes)
+            is_sorted = not transform_func.reorders
 
         return nodes
 
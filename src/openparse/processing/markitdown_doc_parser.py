@@ -1,5 +1,9 @@
 from __future__ import annotations
-from typing import List, Union, Tuple
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from typing import Callable, Dict, List, Optional, Union, Tuple
 from pathlib import Path
 try:
     from typing import Literal  # Python 3.8+ specific
@@ -7,32 +11,83 @@ except ImportError:
     from typing_extensions import Literal  # fallback for Python 3.7
 
 from markitdown import MarkItDown
-from openparse.schemas import Node, FileMetadata
+from openparse.schemas import Bbox, FileMetadata, Node, NodeVariant, TextElement
+
+SUPPORTED_FORMATS = frozenset(
+    {'.pdf', '.docx', '.pptx', '.xlsx', '.html', '.txt', '.json', '.xml', '.zip'}
+)
+# Formats whose conversion is CPU-bound enough to be worth a worker process
+CPU_BOUND_FORMATS = frozenset({'.pdf'})
+
 
 class DocumentParser:
     """Parser using Microsoft's MarkItDown for multiple file formats."""
     
-    SUPPORTED_FORMATS = {'.pdf', '.docx', '.pptx', '.xlsx', '.html', '.txt', '.json', '.xml', '.zip'}
+    SUPPORTED_FORMATS = SUPPORTED_FORMATS
+    CPU_BOUND_FORMATS = CPU_BOUND_FORMATS
     
     def __init__(self, use_ocr: bool = False, llm_client: Optional[object] = None):
         self.parser = MarkItDown(llm_client=llm_client) if llm_client else MarkItDown()
         self.use_ocr = use_ocr
+        self.llm_client = llm_client
         self.logger = logging.getLogger(__name__)
 
-    def parse_batch(self, files: List[Path], batch_size: int = 1) -> List[Tuple[List[Node], FileMetadata]]:
-        """Process multiple files in batches."""
-        results = []
-        
-        for batch in range(0, len(files), batch_size):
-            batch_files = files[batch:batch + batch_size]
-            for file in batch_files:
-                try:
-                    result = self.parse(file)
-                    results.append(result)
-                except Exception as e:
-                    self.logger.error(f"❌ Failed to parse {file}: {e}")
-        
+    def parse_batch(
+        self,
+        files: List[Path],
+        batch_size: int = 1,
+        max_workers: Optional[int] = None,
+    ) -> List[Tuple[List[Node], FileMetadata]]:
+        """
+        Process multiple files concurrently.
+
+        Batches containing CPU-bound formats (PDF) are spread across processes; everything
+        else, and any batch using an LLM client (which can't be pickled into a worker
+        process), runs on threads since conversion is dominated by file IO.
+        Files that fail to parse are logged and skipped; the rest keep their input order.
+        `batch_size` is the number of files handed to a process worker at a time.
+        """
+        results = self._map_files(files, batch_size, max_workers)
+        return [result for result in results if result is not None]
+
+    def _map_files(
+        self,
+        files: List[Path],
+        batch_size: int = 1,
+        max_workers: Optional[int] = None,
+    ) -> List[Optional[Tuple[List[Node], FileMetadata]]]:
+        """Like `parse_batch`, but keeps a None in place of each file that failed."""
+        workers = min(max_workers or os.cpu_count() or 1, len(files))
+        if workers <= 1:
+            return [self._try_parse(file) for file in files]
+
+        use_processes = self.llm_client is None and any(
+            Path(file).suffix.lower() in self.CPU_BOUND_FORMATS for file in files
+        )
+        executor: Executor
+        parse_one: Callable[[Path], Optional[Tuple[List[Node], FileMetadata]]]
+        if use_processes:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.use_ocr,),
+            )
+            parse_one, chunksize = _parse_in_worker, batch_size
+        else:
+            executor = ThreadPoolExecutor(max_workers=min(workers, 32))
+            parse_one, chunksize = self._try_parse, 1
+
+        with executor:
+            results = list(executor.map(parse_one, files, chunksize=chunksize))
         return results
+
+    def _try_parse(self, file: Union[str, Path]) -> Optional[Tuple[List[Node], FileMetadata]]:
+        """Parse a single file, logging and returning None if it fails."""
+        try:
+            return self.parse(file)
+        except Exception as e:
+            self.logger.error(f"❌ Failed to parse {file}: {e}")
+            return None
     
     def _get_metadata(self, result, file_path: Path) -> Dict:
         """Extract metadata from MarkItDown result."""
@@ -49,27 +104,29 @@ class DocumentParser:
     def _text_to_nodes(self, text: str, start_page: int = 1) -> List[Node]:
         """Convert text content to nodes."""
         nodes = []
-        if text and len(text.strip()) > 0:
-            chunks = [text[i:i+1000] for i in range(0, len(text), 1000)]
-            
-            for i, chunk in enumerate(chunks, start_page):
-                if chunk.strip():
-                    element = TextElement(
-                        text=chunk.strip(),
-                        lines=(),
-                        bbox=Bbox(
-                            page=i,
-                            page_height=1000,
-                            page_width=1000,
-                            x0=0, y0=0,
-                            x1=1000, y1=1000
-                        ),
-                        variant=NodeVariant.TEXT
-                    )
-                    nodes.append(Node(
-                        elements=(element,),
-                        bbox=element.bbox
-                    ))
+        if not text or text.isspace():
+            return nodes
+
+        # Single pass over fixed windows; blank windows still advance the page number
+        for page, start in enumerate(range(0, len(text), 1000), start_page):
+            chunk = text[start:start + 1000].strip()
+            if chunk:
+                element = TextElement(
+                    text=chunk,
+                    lines=(),
+                    bbox=Bbox(
+                        page=page,
+                        page_height=1000,
+                        page_width=1000,
+                        x0=0, y0=0,
+                        x1=1000, y1=1000
+                    ),
+                    variant=NodeVariant.TEXT
+                )
+                nodes.append(Node(
+                    elements=(element,),
+                    bbox=element.bbox
+                ))
         return nodes
 
     def parse(self, file: Union[str, Path]) -> Tuple[List[Node], FileMetadata]:
@@ -87,10 +144,11 @@ class DocumentParser:
             metadata = self._get_metadata(result, file_path)
             
             text = result.text_content
-            self.logger.debug(f"📑 Extracted text content: {text[:100]}...")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("📑 Extracted text content: %s...", text[:100])
             
             nodes = self._text_to_nodes(text)
-            self.logger.debug(f"🔢 Created {len(nodes)} nodes from document")
+            self.logger.debug("🔢 Created %d nodes from document", len(nodes))
             
             # Add page count to metadata
             metadata['page_count'] = len(nodes) if nodes else 1
@@ -100,3 +158,18 @@ class DocumentParser:
         except Exception as e:
             self.logger.error(f"❌ Error details: {str(e)}", exc_info=True)
             raise ValueError(f"❌ Failed to parse {file_path}: {str(e)}")
+
+
+# Per-process parser used by batch workers
+_worker_parser: Optional[DocumentParser] = None
+
+
+def _init_worker(use_ocr: bool = False) -> None:
+    global _worker_parser
+    _worker_parser = DocumentParser(use_ocr=use_ocr)
+
+
+def _parse_in_worker(file_path: Path) -> Optional[Tuple[List[Node], FileMetadata]]:
+    """Parse a single file in a worker process. Returns None if parsing fails."""
+    assert _worker_parser is not None, "Worker not initialized."
+    return _worker_parser._try_parse(file_path)
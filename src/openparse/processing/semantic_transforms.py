@@ -1,14 +1,11 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 
+import numpy as np
+
+from openparse import embeddings
 from openparse.schemas import Node
-from openparse.embeddings import (
-    EmbeddingsProvider,
-    EmbeddingsClient,
-    OpenAIEmbeddings,
-    OllamaEmbeddings,
-    CloudflareEmbeddings,
-    cosine_similarity
-)
+from openparse.embeddings import EmbeddingsProvider, EmbeddingsClient
+from openparse.embeddings.quantization import quantize_int8
 
 from .basic_transforms import ProcessingStep
 from openparse.config import Config
@@ -27,13 +24,31 @@ def create_embeddings_client(
     print(f"🤖 Embedding provider: {provider}")
     
     if provider == EmbeddingsProvider.OLLAMA:
-        return OllamaEmbeddings(**clean_kwargs)
+        return embeddings.OllamaEmbeddings(**clean_kwargs)
     elif provider == EmbeddingsProvider.OPENAI:
-        return OpenAIEmbeddings(**clean_kwargs)
+        return embeddings.OpenAIEmbeddings(**clean_kwargs)
     elif provider == EmbeddingsProvider.CLOUDFLARE:
-        return CloudflareEmbeddings(**clean_kwargs)
+        return embeddings.CloudflareEmbeddings(**clean_kwargs)
     raise ValueError(f"❌ Unknown embeddings provider: {provider}")
 
+
+def _row_similarities(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of each row of `a` with the matching row of `b`, for rows produced by
+    `CombineNodesSemantically._embed_for_similarity`.
+    """
+    if a.dtype != np.int8:
+        # fp32 rows are already unit-norm
+        return np.einsum("ij,ij->i", a, b)
+
+    # int8 rows aren't unit-norm; accumulate in int32 and let the per-row scales cancel
+    a = a.astype(np.int32)
+    b = b.astype(np.int32)
+    dots = np.einsum("ij,ij->i", a, b)
+    norms = np.sqrt(np.einsum("ij,ij->i", a, a)) * np.sqrt(np.einsum("ij,ij->i", b, b))
+    return np.divide(dots, norms, out=np.zeros(len(dots)), where=norms > 0)
+
+
 class CombineNodesSemantically(ProcessingStep):
     """
     Combines nodes that are semantically related using configurable embeddings.
@@ -45,6 +60,7 @@ class CombineNodesSemantically(ProcessingStep):
         model: Optional[str] = None,
         min_similarity: float = 0.8,
         max_tokens: int = 1000,
+        similarity_dtype: Literal["fp32", "int8"] = "fp32",
         **kwargs
     ):
         self.config = config or Config()
@@ -58,43 +74,124 @@ class CombineNodesSemantically(ProcessingStep):
         )
         self.min_similarity = min_similarity
         self.max_tokens = max_tokens
+        self.similarity_dtype = similarity_dtype
 
     def process(self, nodes: List[Node]) -> List[Node]:
-        modified = True
-        while modified:
-            modified = False
-            nodes = sorted(nodes)
-
-            embeddings = self.embedding_client.embed_many([node.text for node in nodes])
-            i = 0
-
-            while i < len(nodes) - 1:
-                current_embedding = embeddings[i]
-                next_embedding = embeddings[i + 1]
-                similarity = cosine_similarity(current_embedding, next_embedding)
-                is_within_token_limit = (
-                    nodes[i].tokens + nodes[i + 1].tokens <= self.max_tokens
+        # nothing to merge, and no reason to pay for an embedding round-trip
+        if len(nodes) < 2:
+            return list(nodes)
+        nodes = sorted(nodes)
+
+        embeddings = self._embed_for_similarity([node.text for node in nodes])
+        # similarities[j] is between the original nodes[j] and nodes[j + 1]
+        similarities = _row_similarities(embeddings[:-1], embeddings[1:]).tolist()
+        # a merged node's token count is the sum of its parts, so track it without re-tokenizing
+        tokens = [node.tokens for node in nodes]
+
+        # Single left-to-right pass; the output is a stack whose top absorbs similar neighbours
+        out_nodes = [nodes[0]]
+        out_embeddings = [embeddings[0]]
+        out_tokens = [tokens[0]]
+        for j in range(1, len(nodes)):
+            if out_nodes[-1] is nodes[j - 1]:
+                similarity = similarities[j - 1]
+            else:
+                similarity = self._similarity(out_embeddings[-1], embeddings[j])
+
+            if not self._should_merge(similarity, out_tokens[-1] + tokens[j]):
+                out_nodes.append(nodes[j])
+                out_embeddings.append(embeddings[j])
+                out_tokens.append(tokens[j])
+                continue
+
+            self._merge_into_top(out_nodes, out_embeddings, out_tokens, nodes[j], tokens[j])
+            # the merged node may now be similar enough to its left neighbour
+            while len(out_nodes) > 1 and self._should_merge(
+                self._similarity(out_embeddings[-2], out_embeddings[-1]),
+                out_tokens[-2] + out_tokens[-1],
+            ):
+                out_embeddings.pop()
+                self._merge_into_top(
+                    out_nodes, out_embeddings, out_tokens, out_nodes.pop(), out_tokens.pop()
                 )
 
-                if similarity >= self.min_similarity and is_within_token_limit:
-                    nodes[i] = nodes[i] + nodes[i + 1]
-                    del nodes[i + 1]
-                    del embeddings[i + 1]
+        return out_nodes
 
-                    modified = True
-                    continue
-                i += 1
+    def _should_merge(self, similarity: float, combined_tokens: int) -> bool:
+        return similarity >= self.min_similarity and combined_tokens <= self.max_tokens
 
-        return nodes
+    def _merge_into_top(
+        self,
+        out_nodes: List[Node],
+        out_embeddings: List[np.ndarray],
+        out_tokens: List[int],
+        node: Node,
+        tokens: int,
+    ) -> None:
+        # only the merged node's text changed, so only it needs a new embedding
+        out_nodes[-1] = out_nodes[-1] + node
+        out_tokens[-1] += tokens
+        out_embeddings[-1] = self._embed_for_similarity([out_nodes[-1].text])[0]
+
+    def _embed_for_similarity(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed `texts` as L2-normalized float32 rows, so cosine similarity is a plain dot product.
+        With `similarity_dtype="int8"` the rows are then quantized, cutting their size by 4x.
+        """
+        embeddings = np.asarray(
+            self.embedding_client.embed_many(texts), dtype=np.float32
+        )
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12
+        if self.similarity_dtype == "int8":
+            return quantize_int8(embeddings)[0]
+        return embeddings
+
+    @staticmethod
+    def _similarity(a: np.ndarray, b: np.ndarray) -> float:
+        return float(_row_similarities(a[np.newaxis], b[np.newaxis])[0])
 
     def _get_node_similarities(self, nodes: List[Node]) -> List[float]:
         """
         Get the similarity of each node with the node that precedes it
         """
-        embeddings = self.embedding_client.embed_many([node.text for node in nodes])
+        if len(nodes) < 2:
+            return [0.0]
 
-        similarities = []
-        for i in range(1, len(embeddings)):
-            similarities.append(cosine_similarity(embeddings[i - 1], embeddings[i]))
+        embeddings = self._embed_for_similarity([node.text for node in nodes])
+        return [0.0] + _row_similarities(embeddings[:-1], embeddings[1:]).tolist()
 
-        return [0] + similarities
+
+class EmbedNodes(ProcessingStep):
+    """
+    Attaches an embedding to every node, fetched for all nodes in a single batched call.
+
+    Not part of any default pipeline; append it with `pipeline.append_transform(EmbedNodes(...))`
+    when the parsed nodes should carry their embeddings.
+    """
+
+    reorders = False
+
+    def __init__(
+        self,
+        config: Optional[Config] = None,
+        model: Optional[str] = None,
+        embedding_client: Optional[EmbeddingsClient] = None,
+        **kwargs
+    ):
+        if embedding_client is None:
+            kwargs.pop("provider", None)
+            embedding_client = create_embeddings_client(
+                provider=(config or Config())._embeddings_provider,
+                model=model,
+                **kwargs
+            )
+        self.embedding_client = embedding_client
+
+    def process(self, nodes: List[Node]) -> List[Node]:
+        if not nodes:
+            return nodes
+
+        embeddings = self.embedding_client.embed_many([node.text for node in nodes])
+        for node, embedding in zip(nodes, embeddings):
+            node.embedding = embedding
+        return nodes
@@ -0,0 +1,11 @@
+import pytest
+
+from openparse.embeddings import _cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_shared_caches():
+    # clients for the same model share a process-wide cache
+    _cache._shared_caches.clear()
+    yield
+    _cache._shared_caches.clear()
@@ -0,0 +1,159 @@
+import pytest
+
+from openparse.embeddings._cache import EmbeddingCache
+
+
+def test_get_or_embed_only_fetches_misses():
+    cache = EmbeddingCache()
+    cache.put("a", [1.0])
+    calls = []
+
+    def embed(texts):
+        calls.append(texts)
+        return [[float(len(t))] for t in texts]
+
+    res = cache.get_or_embed(["a", "bb", "ccc"], embed)
+
+    assert res == [[1.0], [2.0], [3.0]]
+    assert calls == [["bb", "ccc"]]
+    assert cache.get("ccc") == [3.0]
+
+
+def test_cache_evicts_least_recently_used():
+    cache = EmbeddingCache(maxsize=2)
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    cache.get("a")
+    cache.put("c", [3.0])
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+
+
+def test_zero_maxsize_disables_cache():
+    cache = EmbeddingCache(maxsize=0)
+    cache.put("a", [1.0])
+    assert cache.get("a") is None
+
+
+def test_get_or_embed_dedupes_misses():
+    calls = []
+
+    def embed(texts):
+        calls.append(texts)
+        return [[float(len(t))] for t in texts]
+
+    res = EmbeddingCache(maxsize=0).get_or_embed(["a", "bb", "a", "bb"], embed)
+
+    assert calls == [["a", "bb"]]
+    assert res == [[1.0], [2.0], [1.0], [2.0]]
+
+
+def test_namespace_separates_keys():
+    a = EmbeddingCache(namespace="model-a")
+    b = EmbeddingCache(namespace="model-b")
+    assert a.key("text") != b.key("text")
+
+
+def test_shared_cache_is_reused_per_namespace():
+    from openparse.embeddings._cache import _shared_caches, shared_cache
+
+    _shared_caches.clear()
+    a = shared_cache("ollama:bge-large", 10)
+    b = shared_cache("ollama:bge-large", 20)
+
+    assert a is b
+    assert a.maxsize == 20
+    assert shared_cache("ollama:nomic-embed-text", 10) is not a
+    assert shared_cache("ollama:bge-large", 0).maxsize == 0
+    _shared_caches.clear()
+
+
+def test_disk_cache_survives_a_new_cache(tmp_path):
+    from openparse.embeddings._disk_cache import DiskEmbeddingCache
+
+    path = tmp_path / "embeddings.sqlite"
+    first = EmbeddingCache(namespace="m", disk=DiskEmbeddingCache(path, "m"))
+    first.get_or_embed(["a", "bb"], lambda texts: [[float(len(t)), 0.5] for t in texts])
+
+    # a fresh in-memory cache, as in a new process, is filled from disk without embedding
+    second = EmbeddingCache(namespace="m", disk=DiskEmbeddingCache(path, "m"))
+
+    def embed(texts):
+        raise AssertionError(f"unexpected embed call for {texts}")
+
+    assert second.get_or_embed(["bb", "a"], embed) == [[2.0, 0.5], [1.0, 0.5]]
+    assert second.get("a") == [1.0, 0.5]
+
+
+def test_disk_cache_ttl_expires_rows(tmp_path):
+    from openparse.embeddings._disk_cache import DiskEmbeddingCache
+
+    disk = DiskEmbeddingCache(tmp_path / "embeddings.sqlite", ttl=-1)
+    disk.put(b"k", [1.0])
+
+    assert disk.get(b"k") is None
+
+
+def test_shared_cache_uses_disk_cache_from_env(tmp_path, monkeypatch):
+    from openparse.embeddings import _cache
+
+    monkeypatch.setattr(_cache, "_shared_caches", {})
+    monkeypatch.setenv("OPENPARSE_EMBEDDINGS_CACHE", str(tmp_path / "embeddings.sqlite"))
+
+    cache = _cache.shared_cache("disk-test", 8)
+
+    assert cache.disk is not None
+    assert cache.disk.path == tmp_path / "embeddings.sqlite"
+    assert cache.disk.ttl is None
+
+
+def test_shared_cache_reads_disk_ttl_from_env(tmp_path, monkeypatch):
+    from openparse.embeddings import _cache
+
+    monkeypatch.setattr(_cache, "_shared_caches", {})
+    monkeypatch.setenv("OPENPARSE_EMBEDDINGS_CACHE", str(tmp_path / "embeddings.sqlite"))
+    monkeypatch.setenv("OPENPARSE_EMBEDDINGS_CACHE_TTL", "3600")
+
+    assert _cache.shared_cache("disk-ttl-test", 8).disk.ttl == 3600.0
+
+    monkeypatch.setenv("OPENPARSE_EMBEDDINGS_CACHE_TTL", "a week")
+    with pytest.raises(ValueError):
+        _cache.shared_cache("disk-ttl-bad", 8)
+
+
+def test_normalized_keys_ignore_whitespace_differences():
+    cache = EmbeddingCache(normalize=True)
+    cache.put("some  chunk\n", [1.0])
+
+    assert cache.get("some chunk") == [1.0]
+    assert cache.get("Some chunk") is None
+    assert EmbeddingCache().key("a b") != EmbeddingCache().key("a  b")
+
+
+def test_disk_cache_round_trips_mixed_sizes(tmp_path):
+    from openparse.embeddings._disk_cache import DiskEmbeddingCache
+
+    disk = DiskEmbeddingCache(tmp_path / "embeddings.sqlite")
+    disk.put_many({b"a": [1.0, 2.0], b"b": [3.0, 4.0]})
+    disk.put(b"c", [5.0])
+
+    assert disk.get_many([b"a", b"b", b"c", b"missing"]) == {
+        b"a": [1.0, 2.0],
+        b"b": [3.0, 4.0],
+        b"c": [5.0],
+    }
+
+
+def test_results_do_not_alias_cached_vectors():
+    cache = EmbeddingCache()
+    res = cache.get_or_embed(["a", "b", "a"], lambda texts: [[1.0] for _ in texts])
+
+    assert res[0] is not res[2]
+    res[0][0] = 99.0
+    res[1].append(2.0)
+
+    assert cache.get("a") == [1.0]
+    assert cache.get("b") == [1.0]
+    assert cache.get_or_embed(["a"], lambda texts: []) == [[1.0]]
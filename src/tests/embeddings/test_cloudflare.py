@@ -0,0 +1,81 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from openparse.embeddings.cloudflare import CloudflareEmbeddings
+
+
+def _response(vectors):
+    response = MagicMock(status_code=200)
+    response.content = json.dumps(
+        {"success": True, "result": {"data": vectors}}
+    ).encode()
+    return response
+
+
+@pytest.fixture
+def embedder():
+    client = CloudflareEmbeddings(api_token="token", account_id="account", batch_size=2)
+    client.session = MagicMock()
+    return client
+
+
+def test_connection_probe_is_opt_in():
+    with patch.object(CloudflareEmbeddings, "_check_connection") as check:
+        CloudflareEmbeddings(api_token="token", account_id="account")
+        check.assert_not_called()
+
+        CloudflareEmbeddings(
+            api_token="token", account_id="account", verify_connection=True
+        )
+        check.assert_called_once()
+
+
+def test_embed_many_sends_one_request_per_batch(embedder):
+    embedder.session.post.side_effect = [
+        _response([[1.0, 0.0], [0.0, 1.0]]),
+        _response([[1.0, 1.0]]),
+    ]
+
+    res = embedder.embed_many(["a", "b", "c"])
+
+    assert embedder.session.post.call_count == 2
+    first_call = embedder.session.post.call_args_list[0]
+    assert json.loads(first_call.kwargs["data"]) == {"text": ["a", "b"]}
+    assert res == [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]
+
+
+def test_embed_many_rejects_mismatched_batch(embedder):
+    embedder.session.post.return_value = _response([[1.0, 0.0]])
+
+    with pytest.raises(ValueError, match="Unexpected response format"):
+        embedder._get_embeddings_batch.__wrapped__(embedder, ["a", "b"])
+
+
+def test_embed_many_array_keeps_empty_text_positions(embedder):
+    embedder.session.post.return_value = _response([[1.0, 2.0], [3.0, 4.0]])
+
+    out = embedder.embed_many_array(["a", "", "b"])
+
+    assert out.dtype == np.float16
+    np.testing.assert_array_equal(out, [[1.0, 2.0], [0.0, 0.0], [3.0, 4.0]])
+
+
+def test_session_is_shared_and_credential_free():
+    a = CloudflareEmbeddings(api_token="token-a", account_id="account")
+    b = CloudflareEmbeddings(api_token="token-b", account_id="account")
+
+    assert a.session is b.session
+    assert "Authorization" not in a.session.headers
+
+
+def test_credentials_sent_per_request(embedder):
+    embedder.session.post.return_value = _response([[1.0]])
+
+    embedder.embed_many(["a"])
+
+    headers = embedder.session.post.call_args.kwargs["headers"]
+    assert headers["Authorization"] == "Bearer token"
+    assert headers["Content-Type"] == "application/json"
@@ -0,0 +1,194 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+from requests.exceptions import HTTPError
+
+from openparse.embeddings.ollama import OllamaEmbeddings
+
+
+def _response(payload, status_code=200):
+    response = MagicMock(status_code=status_code)
+    response.content = json.dumps(payload).encode()
+    if status_code >= 400:
+        response.raise_for_status.side_effect = HTTPError(response=response)
+    return response
+
+
+@pytest.fixture
+def embedder():
+    client = OllamaEmbeddings(api_url="http://localhost:11434/")
+    client.session = MagicMock()
+    return client
+
+
+def test_connection_probe_is_opt_in():
+    with patch.object(OllamaEmbeddings, "_check_connection") as check:
+        OllamaEmbeddings(api_url="http://localhost:11434")
+        check.assert_not_called()
+
+        OllamaEmbeddings(api_url="http://localhost:11434", verify_connection=True)
+        check.assert_called_once()
+
+
+def test_embed_many_uses_batch_endpoint(embedder):
+    embedder.session.post.side_effect = lambda url, **kw: _response(
+        {"embeddings": [[float(len(t))] for t in json.loads(kw["data"])["input"]]}
+    )
+
+    res = embedder.embed_many(["a", "bb"])
+
+    assert res == [[1.0], [2.0]]
+    embedder.session.post.assert_called_once()
+    assert embedder.session.post.call_args.args[0] == "http://localhost:11434/api/embed"
+
+
+def test_embed_many_falls_back_on_404(embedder):
+    def post(url, **kw):
+        if url.endswith("/api/embed"):
+            return _response({"error": "not found"}, status_code=404)
+        return _response({"embedding": [float(len(json.loads(kw["data"])["prompt"]))]})
+
+    embedder.session.post.side_effect = post
+
+    assert embedder.embed_many(["a", "bb"]) == [[1.0], [2.0]]
+    assert embedder.embed_many(["ccc"]) == [[3.0]]
+    urls = [c.args[0] for c in embedder.session.post.call_args_list]
+    assert urls.count("http://localhost:11434/api/embed") == 1
+
+
+def test_embed_many_keeps_empty_text_positions(embedder):
+    embedder.session.post.side_effect = lambda url, **kw: _response(
+        {"embeddings": [[1.0, 2.0]]}
+    )
+
+    res = embedder.embed_many(["", "a", ""])
+
+    assert res == [[0.0, 0.0], [1.0, 2.0], [0.0, 0.0]]
+    assert res[0] is not res[2]
+
+
+def test_max_workers_caps_fallback_thread_pool():
+    client = OllamaEmbeddings(api_url="http://localhost:11434", max_workers=4)
+    client._batch_endpoint = False
+    client.session = MagicMock()
+    client.session.post.return_value = _response({"embedding": [1.0]})
+
+    with patch("openparse.embeddings.ollama.ThreadPoolExecutor", wraps=ThreadPoolExecutor) as pool:
+        assert client.embed_many([str(i) for i in range(10)]) == [[1.0]] * 10
+
+    pool.assert_called_once_with(max_workers=4)
+
+
+def test_aembed_many_falls_back_and_retries():
+    pytest.importorskip("aiohttp")
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    attempts = {"embeddings": 0}
+
+    async def embed(request):
+        return web.Response(status=404)
+
+    async def embeddings(request):
+        attempts["embeddings"] += 1
+        if attempts["embeddings"] == 1:
+            return web.Response(status=503)
+        prompt = json.loads(await request.read())["prompt"]
+        return web.json_response({"embedding": [float(len(prompt))]})
+
+    async def run():
+        app = web.Application()
+        app.router.add_post("/api/embed", embed)
+        app.router.add_post("/api/embeddings", embeddings)
+        async with TestServer(app) as server:
+            client = OllamaEmbeddings(
+                api_url=str(server.make_url("/")), retry_delay=0
+            )
+            try:
+                first = await client.aembed_many(["a", "", "bb"])
+                session = client._asession
+                await client.aembed_many(["ccc"])
+                assert client._asession is session
+            finally:
+                await client.aclose()
+            return first
+
+    assert asyncio.run(run()) == [[1.0], [0.0], [2.0]]
+    assert attempts["embeddings"] == 4
+
+
+def test_slow_batch_does_not_abort_embed_many():
+    pytest.importorskip("aiohttp")
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+    from requests.exceptions import Timeout
+
+    async def embed(request):
+        texts = json.loads(await request.read())["input"]
+        await asyncio.sleep(0.3)
+        return web.json_response({"embeddings": [[1.0] for _ in texts]})
+
+    async def run():
+        app = web.Application()
+        app.router.add_post("/api/embed", embed)
+        async with TestServer(app) as server:
+            url = str(server.make_url("/"))
+            loop = asyncio.get_running_loop()
+            client = OllamaEmbeddings(api_url=url, cache_size=0)
+            try:
+                res = await loop.run_in_executor(None, client.embed_many, ["a", "b"])
+                assert res == [[1.0], [1.0]]
+                assert await client.aembed_many(["a", "b"]) == [[1.0], [1.0]]
+            finally:
+                await client.aclose()
+
+            impatient = OllamaEmbeddings(api_url=url, cache_size=0, timeout=0.05)
+            with pytest.raises(Timeout):
+                await loop.run_in_executor(None, impatient.embed_many, ["a"])
+
+    asyncio.run(run())
+
+
+def test_dimension_is_probed_once_per_model(embedder):
+    from openparse.embeddings import ollama
+
+    ollama._DIMENSIONS.clear()
+    embedder.session.post.side_effect = lambda url, **kw: _response(
+        {"embeddings": [[0.1, 0.2, 0.3]]}
+    )
+
+    assert embedder.dimension == 3
+    other = OllamaEmbeddings(api_url="http://localhost:11434")
+    other.session = MagicMock()
+    assert other.dimension == 3
+    other.session.post.assert_not_called()
+    assert other.embed_many([""]) == [[0.0, 0.0, 0.0]]
+
+
+def test_async_session_closed_with_its_loop():
+    pytest.importorskip("aiohttp")
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    async def embed(request):
+        texts = json.loads(await request.read())["input"]
+        return web.json_response({"embeddings": [[1.0] for _ in texts]})
+
+    client = None
+
+    async def run():
+        nonlocal client
+        app = web.Application()
+        app.router.add_post("/api/embed", embed)
+        async with TestServer(app) as server:
+            client = OllamaEmbeddings(api_url=str(server.make_url("/")), cache_size=0)
+            await client.aembed_many(["a"])
+            return client._asession
+
+    session = asyncio.run(run())
+
+    assert session.closed
+    assert client._asession is session
@@ -0,0 +1,64 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from openparse.embeddings import openai as openai_embeddings
+from openparse.embeddings.openai import cosine_similarity, cosine_similarity_matrix
+
+
+def test_cosine_similarity_vectors_returns_float():
+    sim = cosine_similarity([1.0, 0.0], [1.0, 1.0])
+    assert isinstance(sim, float)
+    assert sim == pytest.approx(1 / np.sqrt(2), rel=1e-6)
+
+
+def test_cosine_similarity_row_against_matrix():
+    sims = cosine_similarity([1.0, 0.0], [[1.0, 0.0], [0.0, 1.0], [-1.0, 0.0]])
+    np.testing.assert_allclose(sims, [1.0, 0.0, -1.0], atol=1e-6)
+
+
+def test_cosine_similarity_matrix_shape():
+    a = np.random.rand(3, 8)
+    b = np.random.rand(5, 8)
+    sims = cosine_similarity_matrix(a, b)
+    assert sims.shape == (3, 5)
+    assert sims.dtype == np.float32
+    assert sims[1, 2] == pytest.approx(cosine_similarity(a[1], b[2]), rel=1e-5)
+
+
+def test_cosine_similarity_uses_simsimd_when_available():
+    fake = MagicMock()
+    fake.cosine.return_value = 0.25
+    with patch.object(openai_embeddings, "simsimd", fake):
+        assert cosine_similarity([1.0, 0.0], [1.0, 1.0]) == pytest.approx(0.75)
+    a, b = fake.cosine.call_args.args
+    assert a.dtype == np.float32 and a.flags.c_contiguous
+
+
+def test_cosine_similarity_zero_vectors_agree_across_backends():
+    fake = MagicMock()
+    fake.cosine.return_value = 0.0  # what SimSIMD reports for two zero vectors
+    with patch.object(openai_embeddings, "simsimd", fake):
+        assert np.isnan(cosine_similarity([0.0, 0.0], [0.0, 0.0]))
+        assert np.isnan(cosine_similarity([0.0, 0.0], [1.0, 0.0]))
+    with patch.object(openai_embeddings, "simsimd", None), np.errstate(invalid="ignore"):
+        assert np.isnan(cosine_similarity([0.0, 0.0], [0.0, 0.0]))
+
+
+def test_embed_many_only_requests_uncached_texts():
+    client = MagicMock()
+    client.embeddings.create.side_effect = lambda input, model: MagicMock(
+        data=[MagicMock(embedding=[float(len(t))]) for t in input]
+    )
+    with patch.object(
+        openai_embeddings.OpenAIEmbeddings, "_create_client", return_value=client
+    ):
+        embedder = openai_embeddings.OpenAIEmbeddings(
+            model="text-embedding-3-small", api_key="test"
+        )
+
+    assert embedder.embed_many(["a", "", "bb"]) == [[1.0], [0.0], [2.0]]
+    assert embedder.embed_many(["bb", "ccc"]) == [[2.0], [3.0]]
+    inputs = [c.kwargs["input"] for c in client.embeddings.create.call_args_list]
+    assert inputs == [["a", "bb"], ["ccc"]]
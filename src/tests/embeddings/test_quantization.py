@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from openparse.embeddings.openai import cosine_similarity
+from openparse.embeddings.quantization import (
+    cast_embeddings,
+    cosine_similarity_int8,
+    dequantize_int8,
+    quantize_int8,
+)
+
+
+def test_quantize_int8_roundtrip():
+    rng = np.random.default_rng(0)
+    emb = rng.standard_normal((4, 64)).astype(np.float32)
+
+    q, scales = quantize_int8(emb)
+
+    assert q.dtype == np.int8
+    assert scales.shape == (4,)
+    assert np.abs(q).max() == 127
+    np.testing.assert_allclose(dequantize_int8(q, scales), emb, atol=0.05)
+
+
+def test_quantize_int8_zero_vector():
+    q, scales = quantize_int8(np.zeros((1, 8), dtype=np.float32))
+    assert not q.any()
+    assert scales[0] == 1.0
+
+
+def test_cosine_similarity_int8_close_to_fp32():
+    rng = np.random.default_rng(1)
+    a, b = rng.standard_normal((2, 256)).astype(np.float32)
+    (a_q, b_q), _ = quantize_int8(np.stack([a, b]))
+
+    assert cosine_similarity_int8(a_q, b_q) == pytest.approx(
+        cosine_similarity(a, b), abs=0.01
+    )
+
+
+def test_cast_embeddings_rejects_unknown_dtype():
+    with pytest.raises(ValueError, match="Unsupported embedding dtype"):
+        cast_embeddings(np.zeros((1, 2), dtype=np.float32), "fp64")
+
+
+def test_fp16_similarity_matches_fp32():
+    rng = np.random.default_rng(2)
+    emb = rng.standard_normal((2, 512)).astype(np.float32)
+    half = cast_embeddings(emb, "fp16")
+
+    assert half.dtype == np.float16
+    assert cosine_similarity(half[0], half[1]) == pytest.approx(
+        cosine_similarity(emb[0], emb[1]), abs=1e-3
+    )
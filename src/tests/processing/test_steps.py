@@ -1,3 +1,5 @@
+from unittest.mock import MagicMock, patch
+
 import pytest
 from openparse.processing import (
     # ProcessingStep,
@@ -546,3 +548,118 @@ def test_no_combine_when_no_heading(short_text_node, longer_text_node):
     assert (
         len(processed_nodes) == 2
     ), "Nodes should remain separate when no heading is present."
+
+
+@pytest.mark.parametrize("similarity_dtype", ["fp32", "int8"])
+def test_combine_nodes_semantically_only_reembeds_merged_node(similarity_dtype):
+    from openparse.processing import semantic_transforms
+
+    calls = []
+
+    def embed_many(texts):
+        calls.append(list(texts))
+        return [[t.count("a"), t.count("b")] for t in texts]
+
+    client = MagicMock()
+    client.embed_many.side_effect = embed_many
+    with patch.object(
+        semantic_transforms, "create_embeddings_client", return_value=client
+    ):
+        processor = semantic_transforms.CombineNodesSemantically(
+            min_similarity=0.9, max_tokens=100, similarity_dtype=similarity_dtype
+        )
+    nodes = [
+        create_text_node("aa", 0, 300, 10, 310),
+        create_text_node("a", 0, 200, 10, 210),
+        create_text_node("bb", 0, 100, 10, 110),
+    ]
+
+    with patch("openparse.schemas.num_tokens", side_effect=lambda s: len(s or "")):
+        processed_nodes = processor.process(nodes)
+
+    assert len(processed_nodes) == 2
+    assert "bb" in processed_nodes[1].text
+    assert len(calls) == 2
+    assert len(calls[0]) == 3
+    assert len(calls[1]) == 1
+
+
+def test_pipeline_only_resorts_after_reordering_steps():
+    from openparse.processing import NoOpIngestionPipeline, ProcessingStep
+
+    seen = []
+
+    class Reverse(ProcessingStep):
+        def process(self, nodes):
+            seen.append(list(nodes))
+            return list(reversed(nodes))
+
+    class Record(ProcessingStep):
+        reorders = False
+
+        def process(self, nodes):
+            seen.append(list(nodes))
+            return nodes
+
+    nodes = [
+        create_text_node("first", 0, 300, 10, 310),
+        create_text_node("second", 0, 200, 10, 210),
+    ]
+    pipeline = NoOpIngestionPipeline()
+    pipeline.append_transform(Record())
+    pipeline.append_transform(Reverse())
+    pipeline.append_transform(Record())
+
+    pipeline.run(list(reversed(nodes)))
+
+    assert seen[0] == seen[1] == seen[2] == sorted(nodes)
+
+
+def test_get_node_similarities_is_relative_to_previous_node():
+    from openparse.processing import semantic_transforms
+
+    client = MagicMock()
+    client.embed_many.return_value = [[1.0, 0.0], [1.0, 1.0], [0.0, 2.0]]
+    with patch.object(
+        semantic_transforms, "create_embeddings_client", return_value=client
+    ):
+        processor = semantic_transforms.CombineNodesSemantically()
+    nodes = [create_text_node(t, 0, 0, 10, 10) for t in ("a", "b", "c")]
+
+    similarities = processor._get_node_similarities(nodes)
+
+    assert similarities == pytest.approx([0.0, 2**-0.5, 2**-0.5], rel=1e-5)
+
+
+def test_row_similarities_int8_large_dimension():
+    import numpy as np
+
+    from openparse.embeddings.quantization import quantize_int8
+    from openparse.processing.semantic_transforms import _row_similarities
+
+    rng = np.random.default_rng(0)
+    rows = rng.standard_normal((2, 1536)).astype(np.float32)
+    q = quantize_int8(rows)[0]
+
+    similarity = _row_similarities(q[:1], q[1:])[0]
+
+    expected = rows[0] @ rows[1] / (np.linalg.norm(rows[0]) * np.linalg.norm(rows[1]))
+    assert similarity == pytest.approx(expected, abs=1e-2)
+
+
+def test_embed_nodes_uses_one_batched_call():
+    from openparse.processing import EmbedNodes
+
+    client = MagicMock()
+    client.embed_many.side_effect = lambda texts: [[float(len(t))] for t in texts]
+    nodes = [
+        create_text_node("one", 0, 300, 10, 310),
+        create_text_node("three", 0, 200, 10, 210),
+    ]
+
+    processed_nodes = EmbedNodes(embedding_client=client).process(nodes)
+
+    client.embed_many.assert_called_once()
+    assert [n.embedding for n in processed_nodes] == [
+        [float(len(n.text))] for n in nodes
+    ]
@@ -19,7 +19,11 @@ Requirements:
     pip install openparse[test]
 """
 
+import asyncio
+import subprocess
+import sys
 import pytest
+from dataclasses import dataclass
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 from datetime import datetime, date
@@ -27,9 +31,49 @@ import zipfile
 import io
 
 from openparse import DocumentParser, ParsedDocument, Node
-from openparse.processing import BasicIngestionPipeline, NoOpIngestionPipeline
+from openparse.processing import (
+    BasicIngestionPipeline,
+    NoOpIngestionPipeline,
+    ProcessingStep,
+)
 from openparse.schemas import TextElement, Bbox, NodeVariant, FileMetadata
 
+# Minimal fixture documents, built once at import
+_TEST_DOCX_BYTES = (
+    b"PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x13\x00\x00\x00"
+    b"[Content_Types].xml"
+)
+
+# Minimal valid PDF with correct /Pages tree
+_TEST_PDF_BYTES = (
+    b"%PDF-1.7\n"
+    b"1 0 obj\n<</Type/Catalog/Pages 2 0 R>>\nendobj\n"
+    b"2 0 obj\n<</Type/Pages/Count 1/Kids[3 0 R]>>\nendobj\n"
+    b"3 0 obj\n<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>\nendobj\n"
+    b"xref\n"
+    b"0 4\n"
+    b"0000000000 65535 f\n"
+    b"0000000009 00000 n\n"
+    b"0000000056 00000 n\n"
+    b"0000000111 00000 n\n"
+    b"trailer\n"
+    b"<</Size 4/Root 1 0 R>>\n"
+    b"startxref\n"
+    b"180\n"
+    b"%%EOF"
+)
+
+@pytest.fixture(scope="session")
+def shared_parser():
+    """A default parser shared by tests that don't modify it."""
+    return DocumentParser()
+
+@pytest.fixture(scope="session")
+def shared_markitdown_parser():
+    """A MarkItDown-backed parser shared by tests that don't modify it."""
+    return DocumentParser(use_markitdown=True)
+
 @pytest.fixture
 def sample_pdf():
     return Path(__file__).parent / "sample_data" / "pdf-with-image.pdf"
@@ -38,10 +82,20 @@ def sample_pdf():
 def sample_docx():
     return Path(__file__).parent / "sample_data" / "docx-test-data.docx"
 
+@dataclass
+class _FakeMDResult:
+    text_content: str = "Test content"
+
+class _FakeMD:
+    """Stand-in for MarkItDown; plain attribute access keeps it cheap in test loops."""
+
+    def convert_local(self, *_args, **_kwargs):
+        return _FakeMDResult()
+
 @pytest.fixture
 def mock_markitdown_result():
     """Create a standard mock result from MarkItDown."""
-    return MagicMock(text_content="Test content")
+    return _FakeMDResult()
 
 @pytest.fixture
 def sample_zip(tmp_path):
@@ -49,31 +103,67 @@ def sample_zip(tmp_path):
     zip_path = tmp_path / "test.zip"
     with zipfile.ZipFile(zip_path, 'w') as zf:
         # Add a PDF file
-        zf.writestr("test.pdf", TestDocumentParser.create_test_pdf())
+        zf.writestr("test.pdf", _TEST_PDF_BYTES)
         # Add a DOCX file
-        zf.writestr("test.docx", TestDocumentParser.create_test_docx())
+        zf.writestr("test.docx", _TEST_DOCX_BYTES)
     return zip_path
 
 @pytest.fixture
-def mock_markitdown():
+def mock_pdf_backend(sample_pdf):
+    """Stub out PDF loading and text extraction with canned elements."""
+    element = TextElement(
+        text="Mocked PDF text",
+        lines=(),
+        bbox=Bbox(
+            page=0,
+            page_height=792,
+            page_width=612,
+            x0=0, y0=0,
+            x1=612, y1=100
+        ),
+        variant=NodeVariant.TEXT
+    )
+    with patch('openparse.doc_parser.Pdf') as pdf, \
+            patch('openparse.doc_parser.text.ingest', return_value=[element]) as ingest:
+        pdf.return_value.num_pages = 1
+        pdf.return_value.file_metadata = {}
+        yield pdf, ingest
+
+class _PassThrough(ProcessingStep):
+    def process(self, nodes):
+        return nodes
+
+class _MinTokens(ProcessingStep):
+    def __init__(self, min_tokens: int):
+        self.min_tokens = min_tokens
+
+    def process(self, nodes):
+        return nodes
+
+# Built once and swapped in per test; only its call history is reset between tests
+_SHARED_MARKITDOWN = MagicMock(return_value=_FakeMD())
+
+@pytest.fixture
+def mock_markitdown(monkeypatch):
     """Create a mock MarkItDown instance."""
-    with patch('openparse.processing.markitdown_doc_parser.MarkItDown') as mock:
-        mock_instance = mock.return_value
-        mock_instance.convert_local.return_value.text_content = "Test content"
-        yield mock
+    import openparse.processing.markitdown_doc_parser as markitdown_doc_parser
+
+    monkeypatch.setattr(markitdown_doc_parser, "MarkItDown", _SHARED_MARKITDOWN)
+    yield _SHARED_MARKITDOWN
+    _SHARED_MARKITDOWN.reset_mock()
 
 class TestMarkItDownDocParser:
     """Tests specific to MarkItDown document parser functionality."""
     
-    def test_supported_formats(self):
+    def test_supported_formats(self, shared_markitdown_parser):
         """Test supported file format detection."""
-        parser = DocumentParser(use_markitdown=True)
+        parser = shared_markitdown_parser
         supported = {'.pdf', '.docx', '.pptx', '.xlsx', '.html', '.txt', '.json', '.xml', '.zip'}
         assert parser.markitdown_parser.SUPPORTED_FORMATS == supported
 
-    def test_text_to_nodes_conversion(self):
+    def test_text_to_nodes_conversion(self, shared_markitdown_parser):
         """Test conversion of text content to nodes."""
-        parser = DocumentParser(use_markitdown=True)
+        parser = shared_markitdown_parser
         text = "Test content\nMultiple lines\nMore content"
         nodes = parser.markitdown_parser._text_to_nodes(text)
         
@@ -82,12 +172,12 @@ class TestMarkItDownDocParser:
         assert isinstance(nodes[0].elements[0], TextElement)
         assert "Test content" in nodes[0].elements[0].text
 
-    def test_metadata_extraction(self, tmp_path):
+    def test_metadata_extraction(self, shared_markitdown_parser, tmp_path):
         """Test file metadata extraction."""
         test_file = tmp_path / "test.txt"
         test_file.write_text("test content")
         
-        parser = DocumentParser(use_markitdown=True)
+        parser = shared_markitdown_parser
         metadata = parser.markitdown_parser._get_metadata(None, test_file)
         
         assert isinstance(metadata, dict)
@@ -98,7 +188,7 @@ class TestMarkItDownDocParser:
         assert "file_type" in metadata
         assert metadata["file_type"] == ".txt"
 
-    def test_batch_processing(self, tmp_path):
+    def test_batch_processing(self, shared_markitdown_parser, tmp_path):
         """Test batch processing of multiple files."""
         # Create test files
         files = []
@@ -107,16 +197,30 @@ class TestMarkItDownDocParser:
             file.write_text(f"content {i}")
             files.append(file)
         
-        parser = DocumentParser(use_markitdown=True)
+        parser = shared_markitdown_parser
         results = parser.markitdown_parser.parse_batch(files, batch_size=2)
         
         assert len(results) == 3
         assert all(isinstance(r, tuple) for r in results)
         assert all(len(r) == 2 for r in results)  # (nodes, metadata)
 
-    def test_zip_processing(self, sample_zip):
+    def test_batch_processing_preserves_order(self, shared_markitdown_parser, tmp_path):
+        """Test that parallel batch processing returns results in input order."""
+        files = []
+        for i in range(4):
+            file = tmp_path / f"test{i}.txt"
+            file.write_text(f"content {i}")
+            files.append(file)
+
+        parser = shared_markitdown_parser
+        results = parser.markitdown_parser.parse_batch(files, max_workers=2)
+
+        texts = [nodes[0].elements[0].text for nodes, _ in results]
+        assert texts == [f"content {i}" for i in range(4)]
+
+    def test_zip_processing(self, shared_markitdown_parser, sample_zip):
         """Test processing of ZIP files."""
-        parser = DocumentParser(use_markitdown=True)
+        parser = shared_markitdown_parser
         nodes, metadata = parser.markitdown_parser.parse(sample_zip)
         
         assert isinstance(nodes, list)
@@ -124,16 +228,16 @@ class TestMarkItDownDocParser:
         assert metadata["is_zip"] is True
         assert metadata["file_type"] == ".zip"
 
-    def test_unsupported_format(self, tmp_path):
+    def test_unsupported_format(self, shared_markitdown_parser, tmp_path):
         """Test error handling for unsupported file formats."""
         unsupported_file = tmp_path / "test.xyz"
         unsupported_file.write_text("test content")
         
-        parser = DocumentParser(use_markitdown=True)
+        parser = shared_markitdown_parser
         with pytest.raises(ValueError, match="Unsupported file format"):
             parser.markitdown_parser.parse(unsupported_file)
 
-    def test_error_handling_in_batch(self, tmp_path):
+    def test_error_handling_in_batch(self, shared_markitdown_parser, tmp_path):
         """Test error handling during batch processing."""
         # Create one valid and one invalid file
         valid_file = tmp_path / "valid.txt"
@@ -141,7 +245,7 @@ class TestMarkItDownDocParser:
         valid_file.write_text("valid content")
         invalid_file.write_text("invalid content")
         
-        parser = DocumentParser(use_markitdown=True)
+        parser = shared_markitdown_parser
         results = parser.markitdown_parser.parse_batch([valid_file, invalid_file])
         
         # Should only get result from valid file
@@ -149,18 +253,18 @@ class TestMarkItDownDocParser:
         assert isinstance(results[0], tuple)
 
     @pytest.mark.parametrize("file_type", [".pdf", ".docx", ".txt"])
-    def test_different_file_types(self, tmp_path, file_type):
+    def test_different_file_types(self, shared_markitdown_parser, tmp_path, file_type):
         """Test processing of different supported file types."""
         test_file = tmp_path / f"test{file_type}"
         
         if file_type == ".pdf":
-            test_file.write_bytes(TestDocumentParser.create_test_pdf())
+            test_file.write_bytes(_TEST_PDF_BYTES)
         elif file_type == ".docx":
-            test_file.write_bytes(TestDocumentParser.create_test_docx())
+            test_file.write_bytes(_TEST_DOCX_BYTES)
         else:
             test_file.write_text("test content")
         
-        parser = DocumentParser(use_markitdown=True)
+        parser = shared_markitdown_parser
         nodes, metadata = parser.markitdown_parser.parse(test_file)
         
         assert isinstance(nodes, list)
@@ -168,9 +272,9 @@ class TestMarkItDownDocParser:
         assert metadata["file_type"] == file_type
 
 class TestDocumentParser:
-    def test_init_default(self):
+    def test_init_default(self, shared_parser):
         """Test default initialization."""
-        parser = DocumentParser()
+        parser = shared_parser
         assert parser._verbose is False
         assert isinstance(parser.processing_pipeline, BasicIngestionPipeline)
         assert parser.table_args is None
@@ -182,6 +286,17 @@ class TestDocumentParser:
         assert parser.use_markitdown is True
         assert hasattr(parser, 'markitdown_parser')
 
+    def test_markitdown_imported_lazily(self):
+        """Test that MarkItDown is only imported by parsers that use it."""
+        code = (
+            "import sys; from openparse import DocumentParser; "
+            "DocumentParser(processing_pipeline=None); "
+            "assert 'markitdown' not in sys.modules; "
+            "DocumentParser(processing_pipeline=None, use_markitdown=True); "
+            "assert 'markitdown' in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
     @pytest.mark.parametrize("verbose", [True, False])
     def test_verbose_setting(self, verbose):
         """Test verbose flag propagation."""
@@ -189,9 +304,21 @@ class TestDocumentParser:
         assert parser._verbose == verbose
         assert parser.processing_pipeline.verbose == verbose
 
-    def test_parse_pdf(self, sample_pdf):
-        """Test PDF parsing."""
-        parser = DocumentParser()
+    def test_parse_pdf(self, sample_pdf, mock_pdf_backend):
+        """Test PDF parsing plumbing, with the PDF backend mocked out."""
+        pdf, ingest = mock_pdf_backend
+        parser = DocumentParser(processing_pipeline=NoOpIngestionPipeline(), result_cache_size=0)
+        result = parser.parse(sample_pdf)
+        assert isinstance(result, ParsedDocument)
+        assert result.filename == sample_pdf.name
+        assert [node.text for node in result.nodes] == ["Mocked PDF text"]
+        pdf.assert_called_once_with(sample_pdf)
+        ingest.assert_called_once_with(pdf.return_value, parsing_method="pdfminer")
+
+    @pytest.mark.integration
+    def test_parse_pdf_integration(self, shared_parser, sample_pdf):
+        """Test PDF parsing end to end with the real PDF backend."""
+        parser = shared_parser
         result = parser.parse(sample_pdf)
         assert isinstance(result, ParsedDocument)
         assert result.filename == sample_pdf.name
@@ -237,76 +364,117 @@ class TestDocumentParser:
         assert len(result.nodes) == 1
         assert result.nodes[0].elements[0].text == "Test content"
 
-    @staticmethod
-    def create_test_docx():
-        """Create valid test DOCX."""
-        content = (
-            b"PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\x00\x00\x00\x00"
-            b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x13\x00\x00\x00"
-            b"[Content_Types].xml"
-        )
-        return content
-
-    @staticmethod
-    def create_test_pdf():
-        """Create minimal valid PDF with correct /Pages tree."""
-        return (
-            b"%PDF-1.7\n"
-            b"1 0 obj\n<</Type/Catalog/Pages 2 0 R>>\nendobj\n"
-            b"2 0 obj\n<</Type/Pages/Count 1/Kids[3 0 R]>>\nendobj\n"
-            b"3 0 obj\n<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>\nendobj\n"
-            b"xref\n"
-            b"0 4\n"
-            b"0000000000 65535 f\n"
-            b"0000000009 00000 n\n"
-            b"0000000056 00000 n\n" 
-            b"0000000111 00000 n\n"
-            b"trailer\n"
-            b"<</Size 4/Root 1 0 R>>\n"
-            b"startxref\n"
-            b"180\n"
-            b"%%EOF"
-        )
-
     def test_directory_processing(self, tmp_path, mock_markitdown):
         """Test directory batch processing."""
         # Create test files
         doc1 = tmp_path / "test1.docx" 
         doc2 = tmp_path / "test2.pdf"
         
-        doc1.write_bytes(self.create_test_docx())
-        doc2.write_bytes(self.create_test_pdf())
-
-        # Configure mock
-        mock_markitdown.return_value.parse.return_value = (
-            [Node(elements=(TextElement(
-                text="Test content",
-                lines=(),
-                bbox=Bbox(
-                    page=1,
-                    page_height=1000,
-                    page_width=1000,
-                    x0=0, y0=0,
-                    x1=1000, y1=1000
-                ),
-                variant=NodeVariant.TEXT
-            ),))],
-            {
-                "creation_date": None,
-                "last_modified_date": date.today(),
-                "last_accessed_date": date.today(),
-                "file_size": 100,
-                "file_type": ".docx"
-            }
-        )
+        doc1.write_bytes(_TEST_DOCX_BYTES)
+        doc2.write_bytes(_TEST_PDF_BYTES)
 
         parser = DocumentParser(use_markitdown=True)
-        results = parser.parse(tmp_path, batch_size=2)
+        # In-process, so the patched MarkItDown applies whatever the start method
+        results = parser.parse(tmp_path, batch_size=2, workers=1)
         
         assert isinstance(results, list)
         assert len(results) == 2
         assert all(isinstance(r, ParsedDocument) for r in results)
 
+    def test_text_directory_processing_uses_threads(self, tmp_path):
+        """Test that directories of IO-bound formats aren't sent to worker processes."""
+        for i in range(3):
+            (tmp_path / f"test{i}.txt").write_text(f"content {i}")
+
+        parser = DocumentParser(processing_pipeline=None, use_markitdown=True)
+        with patch(
+            'openparse.processing.markitdown_doc_parser.ProcessPoolExecutor'
+        ) as process_pool:
+            results = parser.parse(tmp_path, workers=2)
+
+        process_pool.assert_not_called()
+        assert sorted(r.filename for r in results) == ["test0.txt", "test1.txt", "test2.txt"]
+
+    def test_async_directory_processing(self, shared_markitdown_parser, tmp_path):
+        """Test async directory processing with bounded concurrency."""
+        for i in range(3):
+            (tmp_path / f"test{i}.txt").write_text(f"content {i}")
+        (tmp_path / "ignored.xyz").write_text("unsupported")
+
+        parser = shared_markitdown_parser
+        results = asyncio.run(parser.aparse(tmp_path, max_concurrency=2))
+
+        assert sorted(r.filename for r in results) == ["test0.txt", "test1.txt", "test2.txt"]
+        assert all(isinstance(r, ParsedDocument) for r in results)
+
+    def test_pdf_directory_processing(self, tmp_path, sample_pdf):
+        """Test parallel processing of a directory of PDFs."""
+        for name in ("a.pdf", "b.pdf"):
+            (tmp_path / name).write_bytes(sample_pdf.read_bytes())
+        (tmp_path / "notes.txt").write_text("not a pdf")
+
+        parser = DocumentParser(processing_pipeline=NoOpIngestionPipeline())
+        results = parser.parse(tmp_path, workers=2)
+
+        assert sorted(r.filename for r in results) == ["a.pdf", "b.pdf"]
+        assert all(r.nodes for r in results)
+
+    def test_parse_result_cached_on_content(self, tmp_path):
+        """Test that re-parsing identical content is served from the result cache."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("cached content")
+
+        parser = DocumentParser(
+            processing_pipeline=None, use_markitdown=True, result_cache_size=8
+        )
+        with patch.object(
+            parser.markitdown_parser, "parse", wraps=parser.markitdown_parser.parse
+        ) as parse:
+            first = parser.parse(test_file)
+            second = parser.parse(test_file)
+            parser.processing_pipeline.append_transform(_PassThrough())
+            after_append = parser.parse(test_file)
+            test_file.write_text("changed content")
+            third = parser.parse(test_file)
+
+        assert parse.call_count == 3
+        assert second.nodes == first.nodes
+        assert second.nodes[0] is not first.nodes[0]
+        assert [n.text for n in after_append.nodes] == [n.text for n in first.nodes]
+        assert third.nodes[0].text == "changed content"
+
+    def test_parse_result_cache_misses_after_step_changes(self, tmp_path):
+        """Test that reconfiguring a step in place, or clearing the cache, forces a re-parse."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("cached content")
+
+        parser = DocumentParser(
+            processing_pipeline=None, use_markitdown=True, result_cache_size=8
+        )
+        parser.processing_pipeline.append_transform(_MinTokens(10))
+        with patch.object(
+            parser.markitdown_parser, "parse", wraps=parser.markitdown_parser.parse
+        ) as parse:
+            parser.parse(test_file)
+            parser.processing_pipeline.transformations[-1].min_tokens = 50
+            parser.parse(test_file)
+            parser.parse(test_file)
+            parser.clear_result_cache()
+            parser.parse(test_file)
+
+        assert parse.call_count == 3
+
+    def test_parse_result_cache_is_opt_in(self, tmp_path):
+        """Test that parsers don't cache results unless asked to."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("content")
+
+        parser = DocumentParser(processing_pipeline=None, use_markitdown=True)
+        parser.parse(test_file)
+
+        assert parser.result_cache_size == 0
+        assert not parser._result_cache
+
     def test_config_update(self):
         """Test configuration updates."""
         parser = DocumentParser()
@@ -317,10 +485,23 @@ class TestDocumentParser:
         assert config._parse_elements["tables"] is False
         assert config._embeddings_provider == "cloudflare"
 
-    def test_error_handling(self, tmp_path):
+    def test_error_handling(self, shared_parser, tmp_path):
         """Test error handling for invalid files."""
         non_existent = tmp_path / "not_exists.pdf"
-        parser = DocumentParser()
+        parser = shared_parser
         
         with pytest.raises(FileNotFoundError):
             parser.parse(non_existent)
+
+    def test_validate_path(self, tmp_path):
+        """Test that paths are validated without building a parser."""
+        with pytest.raises(FileNotFoundError):
+            DocumentParser._validate_path(tmp_path / "not_exists.pdf")
+        assert DocumentParser._validate_path(str(tmp_path)) == (tmp_path, True)
+
+    def test_table_args_parsed_once(self, shared_parser):
+        """Table args are validated at init and reused for kwargs."""
+        parser = DocumentParser(table_args={"parsing_algorithm": "pymupdf"})
+        assert parser.table_args_obj.parsing_algorithm == "pymupdf"
+        assert parser._get_table_kwargs() == parser.table_args_obj.model_dump()
+        assert shared_parser._get_table_kwargs() is None